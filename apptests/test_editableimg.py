@@ -170,3 +170,23 @@ def test_proc_err(tmp_path):
     )
     with pytest.raises(ZeroDivisionError):
         algEditor.currentProcessor.activate(**kwargs)
+
+
+def test_cursor_info_same_pixel(app):
+    mImg = app.mainImage
+    label = mImg.mouseCoordsLbl
+    mImg.updateCursorInfo(np.array([1, 2]), mImg.image[2, 1])
+    assert label.text() == "Mouse (x,y): 1, 2"
+    label.setText("")
+    # Same pixel, so the label isn't refreshed
+    mImg.updateCursorInfo(np.array([1, 2]), mImg.image[2, 1])
+    assert label.text() == ""
+    # A new image invalidates the last position
+    mImg.setImage(mImg.image.copy())
+    mImg.updateCursorInfo(np.array([1, 2]), mImg.image[2, 1])
+    assert label.text() == "Mouse (x,y): 1, 2"
+    label.setText("")
+    # So does an in-place edit of the pixel under the cursor
+    mImg.image[2, 1] = ~mImg.image[2, 1]
+    mImg.updateCursorInfo(np.array([1, 2]), mImg.image[2, 1])
+    assert label.text() == "Mouse (x,y): 1, 2"
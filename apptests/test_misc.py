@@ -1,6 +1,7 @@
 import ast
 
 import numpy as np
+import pandas as pd
 import pytest
 from qtextras import OptionsDict
 from skimage import data
@@ -9,7 +10,7 @@ from s3a import PRJ_ENUMS, ComplexXYVertices, generalutils as gu
 from s3a.compio.helpers import deserialize
 from s3a.generalutils import DirectoryDict, deprecateKwargs
 from s3a.plugins.multipred import MultiPredictionsPlugin
-from s3a.plugins.tools import functionPluginFactory
+from s3a.plugins.tools import ToolsPlugin, functionPluginFactory
 
 _rots = list(np.linspace(-180, 180, 5)) + [PRJ_ENUMS.ROTATION_OPTIMAL]
 
@@ -57,6 +58,31 @@ def test_plg_factory(app):
     assert count == 1
 
 
+def test_deferred_registration(monkeypatch):
+    monkeypatch.setattr(ToolsPlugin, "_deferredRegisters", {})
+    plugin = ToolsPlugin()
+    registered = []
+
+    def first():
+        pass
+
+    def later():
+        pass
+
+    def registerFunction(func, **kwargs):
+        registered.append((func, kwargs))
+        # Registering can defer other functions while the registry is replayed
+        ToolsPlugin.deferredRegisterFunction(later)
+
+    monkeypatch.setattr(plugin, "registerFunction", registerFunction)
+    ToolsPlugin.deferredRegisterFunction(first, name="First")
+    plugin.registerDeferredFunctions()
+    assert registered == [(first, {"name": "First"})]
+    assert later in ToolsPlugin._deferredRegisters
+    with pytest.raises(TypeError):
+        ToolsPlugin._deferredRegisters[first]["name"] = "Other"
+
+
 def test_pred(app):
     predPlg: MultiPredictionsPlugin = app.classPluginMap[MultiPredictionsPlugin]
     # Correctness of algo already tested elsewhere, run to assert no errors
@@ -75,6 +101,30 @@ def test_vertices_offset():
     assert verts != vertsCopy
 
 
+def test_stacked_mask_difference():
+    rng = np.random.default_rng(0)
+    masks = rng.random((4, 10, 12)) > 0.5
+    stacked = gu.showMaskDifference(masks[:-1], masks[1:])
+    for ii in range(len(masks) - 1):
+        expected = gu.showMaskDifference(masks[ii], masks[ii + 1])
+        assert np.array_equal(stacked[ii], expected)
+
+
+def test_vertices_concatenate():
+    first = ComplexXYVertices([[[0, 0], [5, 5]]], coerceListElements=True)
+    second = ComplexXYVertices([[[1, 1]], [[2, 2]]], coerceListElements=True)
+    out = pd.Series([first, ComplexXYVertices(), second]).s3averts.concatenate()
+    assert out == ([[0, 0], [5, 5]], [[1, 1]], [[2, 2]])
+    assert len(out.hierarchy) == 3
+
+    emptyMaskVerts = ComplexXYVertices.fromBinaryMask(np.zeros((3, 3)))
+    withEmptyMask = pd.Series([first, emptyMaskVerts])
+    assert withEmptyMask.s3averts.concatenate().hierarchy.shape == (1, 4)
+
+    empty = pd.Series([], dtype=object).s3averts.concatenate()
+    assert len(empty) == 0 and empty.hierarchy.shape == (0, 4)
+
+
 @pytest.mark.parametrize("warningType", [DeprecationWarning, FutureWarning])
 def test_deprecation(warningType):
     @deprecateKwargs(b="a", warningType=warningType)
@@ -1,5 +1,8 @@
 import pytest
+from pyqtgraph.parametertree import Parameter, ParameterTree
+from qtextras import fns
 
+from s3a.parameditors import setParametersExpanded
 from s3a.structures import OptionsDict, OptionsDictGroup
 
 pgroup = [OptionsDict("test"), OptionsDict("this")]
@@ -17,3 +20,46 @@ def test_fromString_invalid():
             pgroup, "noparam", default=pgroup[0]
         )
     assert newParam == pgroup[0]
+
+
+def test_fromString_many():
+    assert OptionsDictGroup.fieldsFromParameters(pgroup, ["THIS", pgroup[0]]) == [
+        pgroup[1],
+        pgroup[0],
+    ]
+    with pytest.raises(ValueError):
+        OptionsDictGroup.fieldsFromParameters(pgroup, ["test", "noparam"])
+
+
+def test_set_parameters_expanded():
+    def expandedStates(expandFunc):
+        child = dict(name="b", type="group", expanded=False)
+        param = Parameter.create(
+            name="root",
+            type="group",
+            expanded=False,
+            children=[dict(name="a", type="group", expanded=False, children=[child])],
+        )
+        tree = ParameterTree()
+        tree.setParameters(param)
+        expandFunc(tree)
+        states = []
+        items = tree.topLevelItems()
+        while items:
+            item = items.pop()
+            states.append((item.text(0), item.isExpanded()))
+            items.extend(item.child(ii) for ii in range(item.childCount()))
+        return states
+
+    assert expandedStates(setParametersExpanded) == expandedStates(
+        fns.setParametersExpanded
+    )
+
+
+@pytest.mark.parametrize("updatesEnabled", [True, False])
+def test_set_parameters_expanded_updates(updatesEnabled):
+    tree = ParameterTree()
+    tree.setParameters(Parameter.create(name="root", type="group"))
+    tree.setUpdatesEnabled(updatesEnabled)
+    setParametersExpanded(tree)
+    assert tree.updatesEnabled() == updatesEnabled
@@ -1,7 +1,12 @@
+import gc
+import os
+import types
+
 import pytest
 from pyqtgraph.parametertree import interact
 
-from s3a.parameditors.algcollection import AlgorithmCollection
+from s3a.parameditors import algcollection
+from s3a.parameditors.algcollection import AlgorithmCollection, AlgorithmEditor
 from s3a.processing.pipeline import PipelineParameter, maybeGetFunction
 
 
@@ -51,3 +56,153 @@ def test_algcollection(pipeline):
     assert state == dict(
         top={"Test": ["One", "Two", "Final"]}, primitive={}, modules=[]
     )
+
+
+def test_compiled_state(pipeline, tmp_path):
+    collection = AlgorithmCollection()
+    collection.addProcess(pipeline, top=True)
+    compiledFile = tmp_path / "collection.algc"
+    collection.saveCompiledState(compiledFile)
+
+    loaded = AlgorithmCollection()
+    assert loaded.loadCompiledState(compiledFile)
+    assert loaded.saveParameterValues() == collection.saveParameterValues()
+    assert set(loaded.primitiveProcesses) == set(collection.primitiveProcesses)
+
+
+def test_compiled_function_options(tmp_path):
+    collection = AlgorithmCollection()
+    collection.addFunction(final, name="Bound Final", b=5)
+    compiledFile = tmp_path / "collection.algc"
+    collection.saveCompiledState(compiledFile)
+
+    loaded = AlgorithmCollection()
+    assert loaded.loadCompiledState(compiledFile)
+    process = loaded.primitiveProcesses["Bound Final"]
+    assert process.extra == {"b": 5}
+    assert process()["b"] == 5
+
+
+def test_unpicklable_compiled_state(tmp_path):
+    collection = AlgorithmCollection()
+    collection.addFunction(two, closures=dict(a=lambda: 5))
+    compiledFile = tmp_path / "collection.algc"
+    compiledFile.touch()
+    collection.saveCompiledState(compiledFile)
+    # Stale state is removed so the template is used next time
+    assert not compiledFile.exists()
+    assert not AlgorithmCollection().loadCompiledState(compiledFile)
+
+
+def test_readd_grown_pipeline():
+    collection = AlgorithmCollection()
+    pipe = PipelineParameter(name="Outer")
+    pipe.addStage(one)
+    collection.addProcess(pipe, top=True)
+    inner = PipelineParameter(name="Inner")
+    inner.addStage(two)
+    pipe.addStage(inner)
+    # Stages added to an already stored pipeline are registered on the next add
+    collection.addProcess(pipe, top=True)
+    assert "Inner" in collection.primitiveProcesses
+    assert "Two" in collection.primitiveProcesses
+
+
+def test_stale_compiled_state(pipeline, tmp_path):
+    collection = AlgorithmCollection()
+    collection.addProcess(pipeline, top=True)
+    compiledFile = tmp_path / "collection.algc"
+    collection.saveCompiledState(compiledFile)
+
+    newerSource = tmp_path / "template.yml"
+    newerSource.touch()
+    os.utime(newerSource, (compiledFile.stat().st_mtime + 10,) * 2)
+    assert not AlgorithmCollection().loadCompiledState(
+        compiledFile, sources=[newerSource]
+    )
+
+
+def test_unnested_state(pipeline):
+    outer = PipelineParameter(name="Outer")
+    outer.addStage(pipeline)
+    outer.addStage(one)
+    collection = AlgorithmCollection()
+    state = collection.unnestedProcessState(outer)
+    assert state["top"] == {"Outer": ["Test", "One"]}
+    assert state["primitive"] == {"Test": ["One", "Two", "Final"]}
+
+
+@pytest.fixture()
+def processModule():
+    module = types.ModuleType("s3a_test_processes")
+    exec(
+        "def alpha():\n    return dict(a=1)\n\n"
+        "def beta(a):\n    return dict(b=a)\n\n"
+        "def _gamma(b):\n    return dict(c=b)\n",
+        vars(module),
+    )
+    return module
+
+
+def test_repeat_module_scan(processModule):
+    collection = AlgorithmCollection()
+    titles = collection.addAllModuleProcesses(processModule)
+    # Private members are registered too, in the sorted order of their names
+    assert titles == ["Gamma", "Alpha", "Beta"]
+    # A repeat scan still reports what the module registered
+    assert collection.addAllModuleProcesses(processModule) == titles
+
+    # Removed processes are registered again
+    del collection.primitiveProcesses["Alpha"]
+    assert collection.addAllModuleProcesses(processModule) == titles
+    assert "Alpha" in collection.primitiveProcesses
+
+    # Changed module contents (e.g. after a reload) are picked up
+    exec("def delta():\n    return dict(d=1)\n", vars(processModule))
+    assert "Delta" in collection.addAllModuleProcesses(processModule)
+
+
+def test_state_cache_watches_processes():
+    collection = AlgorithmCollection()
+    for ii in range(3):
+        pipe = PipelineParameter(name="Test")
+        pipe.addStage(one)
+        if ii:
+            pipe.addStage(two)
+        collection.addProcess(pipe, top=True, force=True)
+        expected = ["One", "Two"] if ii else ["One"]
+        assert collection.saveParameterValues()["top"]["Test"] == expected
+        del pipe
+        gc.collect()
+    # Replaced processes aren't kept alive by the cache's hookups
+    assert len(collection._watchedProcesses) <= 1
+
+
+def test_processor_change_suspends_updates(pipeline, monkeypatch):
+    editor = AlgorithmEditor()
+    editor.collection.addProcess(pipeline, top=True)
+    updateStates = []
+    originalExpand = algcollection.setParametersExpanded
+
+    def recordingExpand(tree):
+        updateStates.append(tree.updatesEnabled())
+        originalExpand(tree)
+        updateStates.append(tree.updatesEnabled())
+
+    monkeypatch.setattr(algcollection, "setParametersExpanded", recordingExpand)
+    editor.changeActiveProcessor("Test")
+    # Expanding mustn't re-enable updates before the processor swap finishes
+    assert updateStates == [False, False]
+    assert editor.tree.updatesEnabled()
+
+
+def test_default_processor_per_editor():
+    class NamedEditor(AlgorithmEditor):
+        DEFAULT_PROCESS_NAME = "<Named>"
+
+    first, second = AlgorithmEditor(), NamedEditor()
+    assert first.currentProcessor.name() == AlgorithmEditor.DEFAULT_PROCESS_NAME
+    assert second.currentProcessor.name() == NamedEditor.DEFAULT_PROCESS_NAME
+    first.currentProcessor.addStage(one)
+    assert not second.currentProcessor.hasChildren()
+    assert not AlgorithmEditor().currentProcessor.hasChildren()
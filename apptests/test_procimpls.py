@@ -1,10 +1,13 @@
 import warnings
 
+import cv2 as cv
 import numpy as np
 import pandas as pd
 import pytest
 from qtextras import seriesAsFrame
 from skimage import util
+from skimage.measure import regionprops
+from skimage.morphology import flood
 
 from apptests.conftest import SAMPLE_SMALL_IMG
 from apptests.testingconsts import SAMPLE_IMG
@@ -35,6 +38,148 @@ def test_algs_working(app, vertsPlugin):
             mImg.shapeCollection.sigShapeFinished.emit(XYVertices())
 
 
+def test_full_boundary_connected():
+    # Degenerate shapes are returned unchanged, including their ``connected`` flag
+    verts = XYVertices([[5, 5], [5, 5]], connected=False)
+    assert not ip._fullBoundary(verts).connected
+    assert ip._fullBoundary(XYVertices(verts, connected=True)).connected
+
+
+@pytest.mark.parametrize("componentValues", [[0, 1], [0, 1, 255], [0, 1, 2, 7]])
+@pytest.mark.parametrize("dtype", [bool, "uint8", "int32"])
+def test_grabcut_labels(componentValues, dtype):
+    rng = np.random.default_rng(42)
+    shape = (20, 30)
+    componentValues = np.array(componentValues)
+    if dtype is bool:
+        componentValues = componentValues[componentValues < 2]
+    componentMask = rng.choice(componentValues, shape).astype(dtype)
+    historyMask = rng.choice([0, ip.FGND, ip.BGND, 5], shape).astype("uint8")
+
+    # Previous masked-assignment behavior
+    expected = np.zeros(shape, dtype="uint8")
+    expected[componentMask == 1] = cv.GC_PR_FGD
+    expected[componentMask == 0] = cv.GC_PR_BGD
+    expected[historyMask == ip.FGND] = cv.GC_FGD
+    expected[historyMask == ip.BGND] = cv.GC_BGD
+    np.testing.assert_array_equal(
+        ip._grabcutLabels(componentMask, historyMask), expected
+    )
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "float32"])
+def test_label_mean_colors(dtype):
+    rng = np.random.default_rng(42)
+    image = (rng.random((30, 40, 3)) * 255).astype(dtype)
+    # Includes unlabeled (-1) pixels and unused label values
+    labels = rng.choice([-1, 0, 1, 3, 7], image.shape[:2])
+
+    # Previous regionprops implementation
+    expected = np.zeros_like(image)
+    for lbl in regionprops(labels + 1):
+        coords = lbl.coords
+        intensity = image[coords[:, 0], coords[:, 1], ...].mean(0)
+        expected[coords[:, 0], coords[:, 1], :] = intensity
+    np.testing.assert_allclose(ip._labelMeanColors(image, labels), expected, rtol=1e-6)
+
+
+def test_inverted_history():
+    rng = np.random.default_rng(42)
+    shape = (20, 30)
+    historyMask = rng.choice([ip.UNSPEC, ip.FGND, ip.BGND], shape).astype("uint8")
+    componentMask = rng.random(shape) > 0.5
+    ip.procCache["mask"] = historyMask.copy()
+    bgVerts = XYVertices([[5, 5], [5, 15], [15, 15]])
+    out = ip.format_vertices(
+        np.zeros((*shape, 3), "uint8"),
+        XYVertices(),
+        bgVerts,
+        componentMask,
+        firstRun=False,
+        useFullBoundary=False,
+    )
+
+    # Previous masked-assignment behavior
+    cached = ip.procCache["mask"]
+    expected = cached.copy()
+    expected[cached == ip.FGND] = ip.BGND
+    expected[cached == ip.BGND] = ip.FGND
+    assert not out["asForeground"]
+    np.testing.assert_array_equal(out["historyMask"], expected)
+    # The cached history itself is never inverted
+    assert not np.shares_memory(out["historyMask"], cached)
+    assert np.any(cached != expected)
+    np.testing.assert_array_equal(out["componentMask"], ~componentMask)
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "uint16", "int16", "float32", "int64"])
+@pytest.mark.parametrize("thickness", [1, 2, 5])
+def test_label_boundaries(dtype, thickness):
+    rng = np.random.default_rng(42)
+    labels = rng.choice([0, 1, 2, 300], (30, 40)).astype(dtype)
+    # Large uniform regions make sure interiors are excluded
+    labels[5:20, 5:25] = 1
+
+    # Previous dilate/erode comparison
+    checkLabels = labels
+    if labels.dtype not in [np.uint8, np.uint16, np.int16, np.float32]:
+        checkLabels = labels.astype(np.uint16)
+    size = max(thickness + (thickness % 2 == 0), 3)
+    strel = cv.getStructuringElement(cv.MORPH_RECT, (size, size))
+    expected = cv.morphologyEx(checkLabels, cv.MORPH_DILATE, strel) != cv.morphologyEx(
+        checkLabels, cv.MORPH_ERODE, strel
+    )
+    np.testing.assert_array_equal(ip._labelBoundaries_cv(labels, thickness), expected)
+
+
+@pytest.mark.parametrize("asForeground", [True, False])
+@pytest.mark.parametrize("resizeRatio", [0.5, 1])
+def test_apply_process_result(asForeground, resizeRatio):
+    rng = np.random.default_rng(42)
+    fullMask = np.zeros((40, 50), bool)
+    fullMask[10:20, 15:30] = True
+    boundSlices = (slice(4, 36), slice(10, 50))
+    localShape = (np.array([32, 40]) * resizeRatio).astype(int)
+    image = rng.random(localShape) > 0.7
+    componentMask = rng.random(localShape) > 0.8
+
+    # Previous implementation
+    change = componentMask | image
+    if not asForeground:
+        change = ~change
+    if resizeRatio < 1:
+        change = ip.cv_resize(
+            change.astype(float), (40, 32), asRatio=False, interpolation="INTER_LINEAR"
+        )
+        subset = change[(change > 0.01) & (change < 0.99)].ravel()
+        change = change > 0 if len(subset) == 0 else change > subset.mean()
+    expected = fullMask.copy()
+    expected[boundSlices] = change
+
+    out = ip.apply_process_result(
+        image, asForeground, componentMask, fullMask, boundSlices, resizeRatio
+    )
+    np.testing.assert_array_equal(out["info"]["image"], change)
+    np.testing.assert_array_equal(out["image"], expected[out["boundSlices"]])
+    # Only empty rows/columns are cropped
+    assert np.count_nonzero(out["image"]) == np.count_nonzero(expected)
+
+
+@pytest.mark.parametrize("dtype", [bool, "uint8", "float64"])
+def test_return_to_full_size(dtype):
+    rng = np.random.default_rng(42)
+    fullMask = rng.random((40, 50)) > 0.5
+    boundSlices = (slice(4, 36), slice(10, 50))
+    image = rng.choice([0, 1, 2], (32, 40, 3)).astype(dtype)
+
+    # Previous channel mean
+    expected = np.zeros_like(fullMask)
+    expected[boundSlices] = image.mean(2).astype(int)
+
+    out = ip.return_to_full_size(image, fullMask, boundSlices)
+    np.testing.assert_array_equal(out["image"], expected)
+
+
 @pytest.mark.smallimage
 def test_disable_top_stages(app, vertsPlugin):
     mImg = app.mainImage
@@ -65,6 +210,9 @@ def test_crop_image():
     converters = [
         func for (name, func) in vars(util).items() if name.startswith("img_as_")
     ]
+    # Types OpenCV can't rescale on its own
+    for dtype in np.float16, np.uint32:
+        converters.append(lambda img, dtype=dtype: img.astype(dtype))
     testSizes = max(testShp) * np.array([0.5, 0.8, 1, 5])
     for converter in converters:
         for size in testSizes:
@@ -154,3 +302,60 @@ def test_empty_components(sampleComps):
         )["components"].columns,
         sampleComps.columns,
     )
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "float64"])
+def test_grow_seedpoint(dtype):
+    rng = np.random.default_rng(42)
+    image = (rng.integers(0, 8, (40, 50, 3)) * 30).astype(dtype)
+    seeds = XYVertices([[5, 5], [30, 20], [-1, 3], [60, 10]])
+    grown = ip.growSeedpoint(image, seeds, 30)
+
+    expected = np.zeros(image.shape[:2], dtype=bool)
+    for col, row in seeds[:2]:
+        for chan in range(image.shape[2]):
+            expected |= flood(image[..., chan], (row, col), tolerance=30)
+    assert np.array_equal(grown, expected)
+
+
+def test_component_filters():
+    image = np.zeros((20, 20), dtype=bool)
+    image[1:3, 1:3] = True
+    image[10:16, 10:16] = True
+    image[5:9, 15:19] = True
+
+    kept = ip.remove_small_components(image, sizeThreshold=16)["image"]
+    expected = image.copy()
+    expected[1:3, 1:3] = False
+    assert np.array_equal(kept, expected)
+
+    largest = ip.keep_largest_component(image)["image"]
+    expected[5:9, 15:19] = False
+    assert largest.dtype == image.dtype
+    assert np.array_equal(largest, expected)
+
+
+def test_fill_holes():
+    image = np.zeros((10, 10), dtype=bool)
+    image[2:7, 2:7] = True
+    image[4, 4] = False
+    # Background touching any edge isn't a hole, even if cut off from the corner
+    image[0, :] = True
+    image[:, 0] = True
+    image[1:, 9] = False
+    filled = ip.fill_holes(image)["image"]
+    expected = image.copy()
+    expected[4, 4] = True
+    assert np.array_equal(filled, expected)
+
+
+def test_convert_to_squares():
+    image = np.zeros((20, 20), dtype=bool)
+    image[2, 2:6] = True
+    image[2:8, 2] = True
+    image[12, 15] = True
+    squares = ip.convert_to_squares(image)["image"]
+    expected = np.zeros_like(image)
+    expected[2:8, 2:6] = True
+    expected[12, 15] = True
+    assert np.array_equal(squares, expected)
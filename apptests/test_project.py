@@ -328,3 +328,26 @@ def test_export_autosave(app, filePlugin, tmp_path):
         file.unlink()
     assert not exporter(outpath)
     assert not list(outpath.iterdir())
+
+
+def test_batch_defers_save(tmpProj):
+    tmpProj.config["annotation-format"] = "pkl"
+    with tmpProj.batch():
+        tmpProj.saveConfig()
+        assert fns.attemptFileLoad(tmpProj.configPath)["annotation-format"] != "pkl"
+    assert fns.attemptFileLoad(tmpProj.configPath)["annotation-format"] == "pkl"
+
+
+def test_resolved_paths_per_project(tmp_path):
+    first, second = tmp_path / "first.png", tmp_path / "second.png"
+    link = tmp_path / "link.png"
+    link.symlink_to(first)
+    prj = ProjectData(tmp_path / "first.s3aprj", {})
+    other = ProjectData(tmp_path / "second.s3aprj", {})
+    assert prj.getFullImgName(link) == first
+    link.unlink()
+    link.symlink_to(second)
+    # Paths resolved by one project don't leak into another
+    assert other.getFullImgName(link) == second
+    prj.clearImagesAndAnnotations()
+    assert prj.getFullImgName(link) == second
@@ -8,6 +8,7 @@ from apptests.conftest import NUM_COMPS, dfTester
 from apptests.testingconsts import RND, SAMPLE_IMG, SAMPLE_IMG_FNAME
 from s3a import mkQApp
 from s3a.constants import LAYOUTS_DIR, PRJ_CONSTS as CNST, REQD_TBL_FIELDS
+from s3a.plugins import base as pluginbase
 from s3a.plugins.mainimage import MainImagePlugin
 from s3a.structures import ComplexXYVertices, XYVertices
 
@@ -197,3 +198,55 @@ def test_load_last_settings(tmp_path, sampleComps, app):
     sampleComps[REQD_TBL_FIELDS.IMAGE_FILE] = SAMPLE_IMG_FNAME.name
     sampleComps[REQD_TBL_FIELDS.ID] = sampleComps.index
     assert np.array_equal(sampleComps, app.componentDf)
+
+
+@pytest.mark.parametrize("eps", [1.0, 0.0, -1.0])
+def test_create_simplified_component(app, vertsPlugin, eps):
+    mainImg = app.mainImage
+    app.componentManager.removeComponents()
+    app.changeFocusedComponent()
+    vertsPlugin.props[CNST.PROP_REG_APPROX_EPS] = eps
+    mainImg.drawActionGroup.callAssociatedFunction(CNST.DRAW_ACT_CREATE)
+    plugin = app.classPluginMap[MainImagePlugin]
+    verts = XYVertices([[5, 5], [5, 40], [40, 40], [40, 5]])
+    plugin.createComponent(verts)
+    plugin.createComponent(verts + 50)
+    compDf = app.componentManager.compDf
+    assert len(compDf) == 2
+    # Each component keeps its own vertices rather than sharing a buffer
+    first, second = compDf[REQD_TBL_FIELDS.VERTICES]
+    assert np.array_equal(first.stack().min(0), [5, 5])
+    assert np.array_equal(second.stack().min(0), [55, 55])
+    # Clipping itself reuses one buffer
+    assert np.shares_memory(plugin._clipVertices(verts), plugin._clipVertices(verts))
+
+
+def test_table_field_activation_hooks(app, monkeypatch):
+    class CountingPlugin(pluginbase.TableFieldPlugin):
+        name = "Counting"
+        activations = 0
+
+        def _onActivate(self):
+            self.activations += 1
+
+    # Only the activation logic is under test, so skip building docks, menus and
+    # signal connections on the shared window
+    monkeypatch.setattr(
+        pluginbase.ProcessorPlugin,
+        "attachToWindow",
+        lambda self, window: setattr(self, "window", window),
+    )
+    monkeypatch.setattr(pluginbase, "deferConnection", lambda *args: None)
+    plugin = CountingPlugin()
+    monkeypatch.setattr(plugin, "registerFunction", lambda *args, **kwargs: None)
+    # Hooks are skipped before attaching, then run once the window exists
+    plugin.active = True
+    assert plugin.activations == 0
+    plugin.attachToWindow(app)
+    assert plugin.activations == 1
+    # Attaching again doesn't re-run hooks for an already active plugin
+    plugin.attachToWindow(app)
+    assert plugin.activations == 1
+    plugin.active = False
+    plugin.attachToWindow(app)
+    assert plugin.activations == 2
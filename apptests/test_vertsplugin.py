@@ -4,9 +4,10 @@ import pytest
 from skimage import draw
 
 from apptests.testingconsts import SAMPLE_SMALL_IMG
-from s3a import PRJ_CONSTS, REQD_TBL_FIELDS, XYVertices
-from s3a.generalutils import imageCornerVertices
+from s3a import PRJ_CONSTS, REQD_TBL_FIELDS, ComplexXYVertices, XYVertices
+from s3a.generalutils import getCroppedImage, imageCornerVertices
 from s3a.plugins.file import NewProjectWizard
+from s3a.plugins.tablefield import VerticesPlugin
 from s3a.processing.algorithms import imageproc
 
 
@@ -64,6 +65,23 @@ def test_region_offset(vertsPlugin, sampleComps):
     assert max(vMax) > max(sampleComps[REQD_TBL_FIELDS.VERTICES].s3averts.max())
 
 
+def test_region_grayscale_cache(vertsPlugin, sampleComps, app):
+    shape = app.mainImage.image.shape[:2]
+    region = vertsPlugin.region
+    vertsPlugin.updateRegionFromDf(sampleComps.iloc[[0]])
+    first = vertsPlugin._regionGrayscale(shape)
+    assert vertsPlugin._regionGrayscale(shape) is first
+
+    # In-place edits are picked up once the region is told about them
+    verts = region.regionData[REQD_TBL_FIELDS.VERTICES].iloc[0]
+    shifted = verts.removeOffset([-5, -5])
+    region.regionData.at[region.regionData.index[0], REQD_TBL_FIELDS.VERTICES] = shifted
+    region.markDataChanged()
+    second = vertsPlugin._regionGrayscale(shape)
+    assert not np.array_equal(first, second)
+    assert np.array_equal(second, region.toGrayImage(shape))
+
+
 @pytest.mark.withcomps
 def test_accept_region(app, vertsPlugin):
     comp = app.componentManager.compDf.iloc[[0]]
@@ -97,6 +115,19 @@ def test_region_history(vertsPlugin, app, monkeypatch):
     initial, history = vertsPlugin.getRegionHistory()
     assert np.array_equal(initial, SAMPLE_SMALL_IMG)
     assert len(history)
+    # Stacked masks match rasterizing every buffered region on its own
+    firstId = vertsPlugin.regionBuffer[-1].id_
+    regions = [b.vertices for b in vertsPlugin.regionBuffer if b.id_ == firstId]
+    allVerts = np.vstack([v.stack() for v in regions])
+    _, slices = getCroppedImage(app.mainImage.image, allVerts)
+    expected = [np.zeros(initial.shape[:2], bool)] + [
+        v.removeOffset(slices[0]).toMask(initial.shape[:2], warnIfTooSmall=False) > 0
+        for v in regions
+    ]
+    assert len(history) == len(expected)
+    for mask, expectedMask in zip(history, expected):
+        assert mask.dtype == bool
+        np.testing.assert_array_equal(mask, expectedMask)
     assert np.array_equal(
         history[-1], vertsPlugin.region.toGrayImage(SAMPLE_SMALL_IMG.shape) > 0
     )
@@ -114,3 +145,99 @@ def test_proj_wizard(filePlugin):
     npw = NewProjectWizard(filePlugin)
     for fileLst in npw.fileLists.values():
         assert not fileLst.files
+
+
+def test_apply_offset():
+    verts = [
+        ComplexXYVertices(
+            [XYVertices([[0, 0], [1, 2]]), XYVertices([[3, 3]], connected=False)]
+        ),
+        ComplexXYVertices(),
+        ComplexXYVertices([XYVertices([[5, 6], [7, 8], [9, 9]])]),
+    ]
+    shifted = VerticesPlugin.applyOffset(verts, XYVertices([[10, 20]]))
+    assert len(shifted) == len(verts)
+    for oldComplex, newComplex in zip(verts, shifted):
+        assert len(oldComplex) == len(newComplex)
+        for oldVerts, newVerts in zip(oldComplex, newComplex):
+            assert isinstance(newVerts, XYVertices)
+            assert newVerts.connected == oldVerts.connected
+            np.testing.assert_array_equal(newVerts, oldVerts + [10, 20])
+    # Inputs are left untouched for undo entries
+    np.testing.assert_array_equal(verts[0][0], [[0, 0], [1, 2]])
+
+    empty = VerticesPlugin.applyOffset([ComplexXYVertices()] * 2, XYVertices([[1, 1]]))
+    assert [len(v) for v in empty] == [0, 0]
+
+
+@pytest.mark.withcomps
+def test_empty_region_mask(app, vertsPlugin):
+    comp = app.componentManager.compDf.iloc[[0]]
+    app.changeFocusedComponent(comp.index)
+    assert vertsPlugin.hasActiveEdits
+    emptyMask = np.zeros((5, 5), bool)
+    expected = ComplexXYVertices.fromBinaryMask(emptyMask)
+    vertsPlugin.updateRegionFromMask(emptyMask)
+
+    regionData = vertsPlugin.region.regionData
+    assert list(regionData.index) == list(comp.index)
+    newVerts = regionData[REQD_TBL_FIELDS.VERTICES].iloc[0]
+    assert len(newVerts) == len(expected) == 0
+    assert newVerts.hierarchy.shape == (0, 4)
+    vertsPlugin.actionStack.undo()
+    assert vertsPlugin.hasActiveEdits
+
+
+@pytest.mark.withcomps
+def test_matches_region_mask(app, vertsPlugin):
+    app.changeFocusedComponent(app.componentManager.compDf.index[0])
+    shape = app.mainImage.image.shape[:2]
+    current = vertsPlugin.region.toGrayImage(shape)
+    assert vertsPlugin._matchesRegionMask(current)
+    assert not vertsPlugin._matchesRegionMask(current[:-1])
+    changed = current.copy()
+    changed[0, 0] = 0 if changed[0, 0] else 1
+    assert not vertsPlugin._matchesRegionMask(changed)
+
+    vertsPlugin.clearFocusedRegion()
+    assert vertsPlugin._matchesRegionMask(np.zeros(shape, "uint8"))
+    assert not vertsPlugin._matchesRegionMask(np.ones(shape, "uint8"))
+
+
+def test_clear_processor_history(monkeypatch):
+    monkeypatch.setitem(imageproc.procCache, "mask", np.ones((3, 3), "uint8"))
+    undoEntry = imageproc.procCache.copy()
+    VerticesPlugin.clearProcessorHistory()
+    assert not imageproc.procCache["mask"].any()
+    # Undo entries share the old array, so it must not be zeroed in place
+    assert undoEntry["mask"].all()
+    cleared = imageproc.procCache["mask"]
+    VerticesPlugin.clearProcessorHistory()
+    assert imageproc.procCache["mask"] is cleared
+
+
+@pytest.mark.withcomps
+@pytest.mark.smallimage
+def test_displayable_infos_cache(app, vertsPlugin, monkeypatch):
+    app.changeFocusedComponent(app.componentManager.compDf.index[0])
+    computeCalls = []
+    compute = vertsPlugin._computeDisplayableInfos
+
+    def countingCompute(stages):
+        computeCalls.append(stages)
+        return compute(stages)
+
+    monkeypatch.setattr(vertsPlugin, "_computeDisplayableInfos", countingCompute)
+    foregroundVertices = XYVertices([[0, 0], [10, 0], [10, 10]])
+    vertsPlugin.run(foregroundVertices=foregroundVertices)
+    infos = vertsPlugin.getDisplayableInfos()
+    assert vertsPlugin.getDisplayableInfos() == infos
+    assert len(computeCalls) == 1
+    # Callers get their own dict
+    infos["extra"] = None
+    assert "extra" not in vertsPlugin.getDisplayableInfos()
+
+    # New results mean new infos
+    vertsPlugin.run(foregroundVertices=foregroundVertices + 5)
+    vertsPlugin.getDisplayableInfos()
+    assert len(computeCalls) == 2
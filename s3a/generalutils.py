@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import inspect
+import os
 import warnings
 from functools import wraps
+from io import StringIO
 from pathlib import Path
 from typing import Any, Callable, Collection, List, Sequence, Tuple, Union
 
@@ -322,6 +324,10 @@ def imageCornerVertices(image: NChanImg = None) -> XYVertices:
 
 
 def showMaskDifference(oldMask: BlackWhiteImg, newMask: BlackWhiteImg):
+    """
+    Colors pixels removed from ``oldMask`` red and pixels added in ``newMask`` green.
+    Stacks of masks with shape (N, H, W) are compared frame-by-frame in one pass.
+    """
     infoMask = np.tile(oldMask[..., None].astype("uint8") * 255, (1, 1, 3))
     # Was there, now it's not -- color red
     infoMask[oldMask & ~newMask, :] = [255, 0, 0]
@@ -1037,6 +1043,30 @@ def getMaybeReplaceKey(
     return dictionary.get(newKey, default)
 
 
+def saveYamlBuffered(saveObj, savePath: FilePath, sync=False):
+    """
+    Like ``fns.saveToFile``, but the yaml is serialized in memory first so the file
+    receives a single write instead of one per emitted node.
+
+    Parameters
+    ----------
+    saveObj
+        Object to serialize
+    savePath
+        Destination file
+    sync
+        If *True*, the file is flushed to disk with ``os.fsync`` before returning. This
+        is slower, so it should be reserved for explicit checkpoints (i.e. a user save).
+    """
+    buffer = StringIO()
+    fns.yamlDump(saveObj, buffer)
+    with open(savePath, "w") as ofile:
+        ofile.write(buffer.getvalue())
+        if sync:
+            ofile.flush()
+            os.fsync(ofile.fileno())
+
+
 def enumConverter(enumVal):
     if hasattr(enumVal, "value"):
         return enumVal.value
@@ -26,7 +26,7 @@ from ..models.tablemodel import ComponentManager
 from ..parameditors.appstate import AppStateEditor
 from ..parameditors.tablefilter import TableFilterEditor
 from ..plugins import EXTERNAL_PLUGINS, INTERNAL_PLUGINS, tablefield
-from ..plugins.base import ParameterEditorPlugin as PEPlugin
+from ..plugins.base import ParameterEditorPlugin as PEPlugin, connectionQueue
 from ..plugins.file import FilePlugin
 from ..plugins.tools import ToolsPlugin
 from ..shared import SharedAppSettings
@@ -120,11 +120,13 @@ class S3ABase(DASM, QtWidgets.QMainWindow, metaclass=S3ABaseMeta):
         # File plugin is a special case
         self._addPluginObject(self.filePlugin)
         toAdd = INTERNAL_PLUGINS() + EXTERNAL_PLUGINS()
-        for plg in toAdd:
-            if inspect.isclass(plg):
-                self.addPlugin(plg)
-            else:
-                self._addPluginObject(plg)
+        # Plugin signal hookups are made in one pass once every plugin is attached
+        with connectionQueue():
+            for plg in toAdd:
+                if inspect.isclass(plg):
+                    self.addPlugin(plg)
+                else:
+                    self._addPluginObject(plg)
 
         # Create links for commonly used plugins
         # noinspection PyTypeChecker
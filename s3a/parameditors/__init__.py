@@ -2,6 +2,23 @@ from pyqtgraph.parametertree import Parameter, ParameterTree
 from qtextras import EasyWidget, ParameterEditor, fns
 
 
+def setParametersExpanded(tree: ParameterTree, expandedVal=True):
+    """
+    Same as ``fns.setParametersExpanded`` (children of top-level items are expanded,
+    top-level items are left alone), but repaints the tree once instead of once per
+    item. If updates are already suspended by the caller, they stay suspended
+    """
+    wasEnabled = tree.updatesEnabled()
+    tree.setUpdatesEnabled(False)
+    try:
+        for item in tree.topLevelItems():
+            for ii in range(item.childCount()):
+                item.child(ii).setExpanded(expandedVal)
+        tree.resizeColumnToContents(0)
+    finally:
+        tree.setUpdatesEnabled(wasEnabled)
+
+
 class MetaTreeParameterEditor(ParameterEditor):
     _metaTree: ParameterTree
     """
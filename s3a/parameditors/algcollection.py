@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import contextlib
 import copy
+import functools
 import importlib
 import inspect
+import operator
+import pickle
 import pydoc
+import sys
 import types
 import typing as t
+import weakref
 import webbrowser
-from collections import defaultdict
 from pathlib import Path
 
 from pyqtgraph.Qt import QtCore
@@ -20,7 +25,7 @@ from qtextras import (
 )
 from qtextras.typeoverloads import FilePath
 
-from . import MetaTreeParameterEditor
+from . import MetaTreeParameterEditor, setParametersExpanded
 from ..constants import PRJ_ENUMS
 from ..processing.pipeline import (
     PipelineFunction,
@@ -34,6 +39,9 @@ _topDictType = t.Dict[str, t.Union[t.List[str], PipelineParameter]]
 _primitiveDictType = t.Dict[
     str, t.Union[PipelineFunction, t.List[str], PipelineParameter]
 ]
+# Resolved once, since `Union.__args__` is otherwise looked up on every check
+_stageTypes = PipelineStageType.__args__
+_optionalStageTypes = (type(None), *_stageTypes)
 
 
 class _CollectionDict(t.TypedDict):
@@ -42,10 +50,60 @@ class _CollectionDict(t.TypedDict):
     modules: t.List[str]
 
 
+COMPILED_STATE_PROTOCOL = 5
+"""Pickle protocol used by :meth:`AlgorithmCollection.saveCompiledState`"""
+
+
 def _peekFirst(iterable):
     return next(iter(iterable))
 
 
+@functools.lru_cache(maxsize=1024)
+def _locateCached(fullName: str):
+    return pydoc.locate(fullName)
+
+
+def _walkStages(
+    process: PipelineStageType, prune: t.Callable[[PipelineParameter], bool] = None
+) -> t.Iterator[PipelineStageType]:
+    """
+    Lazily yields ``process`` followed by every nested function and pipeline,
+    depth-first. Callers that only need the first match can stop early. If ``prune``
+    is provided, it is called on each pipeline after it is yielded, and that
+    pipeline's stages are skipped when it returns *True*.
+    """
+    yield process
+    if not isinstance(process, PipelineParameter) or (prune and prune(process)):
+        return
+    for child in process:
+        if function := maybeGetFunction(child):
+            yield function
+        elif isinstance(child, PipelineParameter):
+            yield from _walkStages(child, prune)
+
+
+def _internKeys(processDict: dict):
+    """
+    Process names are repeatedly used as lookup keys, so intern them to allow
+    identity-based comparisons during dict lookups
+    """
+    return {sys.intern(name): value for name, value in processDict.items()}
+
+
+def _copyCollectionState(state: dict):
+    """
+    Copies only the containers that ``hierarchicalUpdate`` can modify in place, i.e.
+    the section dicts and their stage lists. Individual stage states are replaced
+    rather than mutated, so a full ``deepcopy`` is unnecessary.
+    """
+    return {
+        key: {name: copy.copy(stages) for name, stages in section.items()}
+        if isinstance(section, dict)
+        else copy.copy(section)
+        for key, section in state.items()
+    }
+
+
 def _splitNameValueMetaDict(processDict: dict):
     """
     Split a dict of ``{process: {valueOpts}, metaOpts}`` into a tuple of
@@ -68,6 +126,57 @@ def _splitNameValueMetaDict(processDict: dict):
     return processName, updateKwargs, processDict
 
 
+def _isImportable(obj):
+    qualname = getattr(obj, "__qualname__", "<locals>")
+    return (
+        inspect.isfunction(obj) or inspect.isclass(obj)
+    ) and "<" not in qualname
+
+
+def _compileProcessDict(collection: "AlgorithmCollection", processDict: dict):
+    out = {}
+    for title, process in processDict.items():
+        if isinstance(process, PipelineFunction):
+            # Cached stage functions keep the original as `__wrapped__`
+            function = inspect.unwrap(process.function)
+            if _isImportable(function):
+                # Bound keywords and closures are needed to rebuild the same stage
+                options = dict(
+                    name=process.__name__,
+                    closures=dict(process.closures),
+                    **process.extra,
+                )
+                out[title] = ("function", function, options)
+        elif isinstance(process, PipelineParameter):
+            stages = _peekFirst(collection.saveStagesByReference(process).values())
+            processType = type(process)
+            if processType is collection.processType or not _isImportable(
+                processType
+            ):
+                processType = None
+            out[title] = ("parameter", processType, stages)
+        else:
+            out[title] = ("stages", None, process)
+    return out
+
+
+def _decompileProcessDict(compiled: dict):
+    out = {}
+    for title, (kind, obj, info) in compiled.items():
+        if kind == "function":
+            out[title] = PipelineFunction(obj, **info)
+            continue
+        if obj is not None:
+            try:
+                out[title] = obj()
+                continue
+            except TypeError:
+                # Needs arguments, fall back to stage names
+                pass
+        out[title] = info
+    return out
+
+
 class AlgorithmEditor(MetaTreeParameterEditor):
     sigProcessorChanged = QtCore.Signal(str)
     """Name of newly selected process"""
@@ -81,7 +190,7 @@ class AlgorithmEditor(MetaTreeParameterEditor):
         self.collection = collection
 
         # Will be set by changeActiveProcessor
-        self.currentProcessor = PipelineParameter(name=self.DEFAULT_PROCESS_NAME)
+        self.currentProcessor = self.defaultProcessor()
         self.props = ParameterContainer()
         self.registerFunction(
             self.changeActiveProcessor,
@@ -90,17 +199,26 @@ class AlgorithmEditor(MetaTreeParameterEditor):
             process="",
             container=self.props,
         )
-        fns.setParametersExpanded(self._metaTree)
+        setParametersExpanded(self._metaTree)
 
         def onChange(name):
             self.props["process"] = name
 
         self.sigProcessorChanged.connect(onChange)
+        self.collection.sigProcessesChanged.connect(self.updateProcessLimits)
         if self.collection.topProcesses:
             top = next(iter(self.collection.topProcesses))
             self.props["process"] = top
             self.props.parameters["process"].setDefault(top)
 
+    @classmethod
+    def defaultProcessor(cls) -> PipelineParameter:
+        """
+        Placeholder used until a real processor is selected. Pipelines are mutable, so
+        every call returns a new instance rather than one shared by all editors
+        """
+        return PipelineParameter(name=cls.DEFAULT_PROCESS_NAME)
+
     def saveParameterValues(
         self,
         saveName: str = None,
@@ -116,7 +234,7 @@ class AlgorithmEditor(MetaTreeParameterEditor):
         proc = self.currentProcessor
         filter_ = ["meta", "default"]
         stateDict = self.collection.unnestedProcessState(proc, processFilter=filter_)
-        clctnState = copy.deepcopy(self.collection.getParameterValues())
+        clctnState = _copyCollectionState(self.collection.getParameterValues())
         fns.hierarchicalUpdate(clctnState, stateDict)
         return {"active": self.currentProcessor.title(), **clctnState}
 
@@ -124,7 +242,7 @@ class AlgorithmEditor(MetaTreeParameterEditor):
         proc = self.currentProcessor
         filter_ = ["meta"]
         stateDict = self.collection.unnestedProcessState(proc, processFilter=filter_)
-        clctnState = copy.deepcopy(self.collection.getParameterDefaults())
+        clctnState = _copyCollectionState(self.collection.getParameterDefaults())
         fns.hierarchicalUpdate(clctnState, stateDict)
         return {"active": self.currentProcessor.title(), **clctnState}
 
@@ -135,7 +253,7 @@ class AlgorithmEditor(MetaTreeParameterEditor):
         processName = stateDict.pop("active", None)
 
         self.collection.loadParameterValues(stateName, stateDict, **kwargs)
-        self.props.parameters["process"].setLimits(list(self.collection.topProcesses))
+        self.updateProcessLimits()
 
         if processName and (process := self._resolveProccessor(processName)):
             self.changeActiveProcessor(process, saveBeforeChange=False)
@@ -184,13 +302,21 @@ class AlgorithmEditor(MetaTreeParameterEditor):
         ):
             self.saveParameterValues(self.stateName, blockWrite=True)
 
-        self.rootParameter.clearChildren()
         process = self._resolveProccessor(process)
         self.currentProcessor = process
-        self.rootParameter.addChild(process)
-        fns.setParametersExpanded(self.tree)
+        # Repaint once after the swap rather than after every item removal/addition
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self.rootParameter.clearChildren()
+            self.rootParameter.addChild(process)
+            setParametersExpanded(self.tree)
+        finally:
+            self.tree.setUpdatesEnabled(True)
         self.sigProcessorChanged.emit(process.title())
 
+    def updateProcessLimits(self):
+        self.props.parameters["process"].setLimits(list(self.collection.topProcesses))
+
     def stateEqualsCurrent(self, other: PipelineParameter | str | None):
         if other is None:
             return False
@@ -213,11 +339,15 @@ class AlgorithmEditor(MetaTreeParameterEditor):
 
 
 class AlgorithmCollection(ParameterEditor):
+    sigProcessesChanged = Signal()
+    """Emitted after processes are added to the collection"""
+
     def __init__(
         self,
         processType=PipelineParameter,
         suffix=".alg",
         template: FilePath = None,
+        compiledState: FilePath = None,
         **kwargs,
     ):
         super().__init__(suffix=suffix, **kwargs)
@@ -225,12 +355,108 @@ class AlgorithmCollection(ParameterEditor):
         self.primitiveProcesses: _primitiveDictType = {}
         self.topProcesses: _topDictType = {}
         self.includeModules: list[str] = []
+        self._suppressChangeSignal = False
+        self._moduleProcessTitles: weakref.WeakKeyDictionary[
+            t.Any, str
+        ] = weakref.WeakKeyDictionary()
+        self._moduleMembersCache: weakref.WeakKeyDictionary[
+            types.ModuleType, tuple[tuple, tuple, list]
+        ] = weakref.WeakKeyDictionary()
+        self._stagesByReferenceCache: dict[str, tuple[PipelineParameter, list]] = {}
+        self._parameterValuesCache: _CollectionDict | None = None
+        self._watchedProcesses: weakref.WeakSet[PipelineParameter] = weakref.WeakSet()
 
         if template is not None:
-            templateDict = self.stateManager.loadState(template)
-            for module in templateDict.get("modules", []):
-                self.addAllModuleProcesses(module)
-            self.loadParameterValues(template, templateDict)
+            self.loadTemplate(template, compiledState)
+
+    def loadTemplate(self, template: FilePath, compiledState: FilePath = None):
+        """
+        Populates this collection from a template file. If ``compiledState`` is
+        provided and is newer than ``template``, it is loaded instead, which avoids
+        scanning every module listed in the template. Otherwise, the template is
+        parsed and the result is cached to ``compiledState``.
+        """
+        if compiledState is not None and self.loadCompiledState(
+            compiledState, sources=[template]
+        ):
+            return
+        templateDict = self.stateManager.loadState(template)
+        for module in templateDict.get("modules", []):
+            self.addAllModuleProcesses(module)
+        self.loadParameterValues(template, templateDict)
+        if compiledState is not None:
+            self.saveCompiledState(compiledState)
+
+    def saveCompiledState(self, file: FilePath):
+        """
+        Pickles the resolved top and primitive processes so a later
+        :meth:`loadCompiledState` can skip module scanning and qualname resolution.
+        Functions are stored by reference along with their bound options, and
+        pipelines are stored as their stage names. Processes that can't be referenced
+        by import (i.e. lambdas or bound methods) are skipped, since their owners
+        re-register them anyway. If any bound option can't be pickled, no state is
+        saved and any old ``file`` is removed, so the template is parsed instead.
+        """
+        compiled = dict(
+            top=_compileProcessDict(self, self.topProcesses),
+            primitive=_compileProcessDict(self, self.primitiveProcesses),
+            modules=list(self.includeModules),
+        )
+        file = Path(file)
+        try:
+            data = pickle.dumps(compiled, protocol=COMPILED_STATE_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            file.unlink(missing_ok=True)
+            return
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(data)
+
+    def loadCompiledState(self, file: FilePath, sources: t.Sequence[FilePath] = ()):
+        """
+        Restores processes saved by :meth:`saveCompiledState`. Returns *False*
+        without modifying the collection if ``file`` doesn't exist or is older than
+        any of ``sources``, in which case the text format should be used instead.
+        """
+        file = Path(file)
+        if not file.exists():
+            return False
+        mtime = file.stat().st_mtime
+        if any(Path(src).stat().st_mtime > mtime for src in sources):
+            return False
+        try:
+            with open(file, "rb") as ifile:
+                compiled = pickle.load(ifile)
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+            # Stale references, i.e. a function was renamed since the last save
+            return False
+        if compiled["modules"] != self.includeModules:
+            _locateCached.cache_clear()
+        self.includeModules = compiled["modules"]
+        with self.bulkAdd():
+            self.topProcesses.update(
+                _internKeys(_decompileProcessDict(compiled["top"]))
+            )
+            self.primitiveProcesses.update(
+                _internKeys(_decompileProcessDict(compiled["primitive"]))
+            )
+        return True
+
+    @contextlib.contextmanager
+    def bulkAdd(self):
+        """
+        Suppresses ``sigProcessesChanged`` until the outermost ``bulkAdd`` exits, so
+        adding many processes results in a single emission
+        """
+        wasSuppressed = self._suppressChangeSignal
+        self._suppressChangeSignal = True
+        try:
+            yield
+        finally:
+            self._suppressChangeSignal = wasSuppressed
+        if not wasSuppressed:
+            # Which stages are saved by reference depends on the primitive processes
+            self._invalidateStateCache()
+            self.sigProcessesChanged.emit()
 
     def saveStagesByReference(
         self,
@@ -242,69 +468,117 @@ class AlgorithmCollection(ParameterEditor):
         replace ``primitive`` stages with their names in the top-level state.
         """
         processState = process.saveState(**kwargs)
-        procTitle, allChildStates = _peekFirst(processState.items())
+        allChildStates = _peekFirst(processState.values())
+        primitives = self.primitiveProcesses
 
-        for child, childState in zip(process, allChildStates):
-            if not isinstance(child, PipelineParameter):
+        for ii, (child, childState) in enumerate(zip(process, allChildStates)):
+            if not isinstance(child, PipelineParameter) or not isinstance(
+                childState, dict
+            ):
                 continue
             childTitle = _peekFirst(childState)
-            if childTitle in self.primitiveProcesses:
+            if childTitle not in primitives:
+                continue
+            if len(childState) == 1:
+                # No metadata, so the child name alone indicates fetch should be
+                # from `primitive` dict
+                allChildStates[ii] = childTitle
+            else:
                 # Set to blank; the presence of the child name will indicate
                 # fetch should be from `primitive` dict
                 childState[childTitle] = {}
-
-        # Simplify dict of {chname: {}} to just chname
-        for ii, childState in enumerate(allChildStates):
-            if len(childState) == 1:
-                childState[ii] = _peekFirst(childState)
         return processState
 
     def addProcess(self, process: PipelineStageType, top=False, force=False):
-        addDict = self.topProcesses if top else self.primitiveProcesses
-        isFunction = isinstance(process, PipelineFunction)
-        title = process.title()
-        saveObj = {title: process}
+        with self.bulkAdd():
+            return self._addProcess(process, top, force)
 
-        if force or title not in addDict or type(addDict[title]) != type(process):
-            addDict.update(saveObj)
-        if isFunction:
-            return title
+    def _addProcess(self, process: PipelineStageType, top=False, force=False):
+        addDict = self.topProcesses if top else self.primitiveProcesses
+        # Pipelines reached again through a shared reference were already walked. Stored
+        # pipelines are still walked, since stages may have been added since then
+        walked: set[int] = set()
+
+        def prune(pipe: PipelineParameter):
+            if id(pipe) in walked:
+                return True
+            walked.add(id(pipe))
+            return False
 
-        for stage in process:
+        for stage in _walkStages(process, prune):
+            title = sys.intern(stage.title())
+            existing = addDict.get(title)
+            if force or existing is None or type(existing) != type(stage):
+                addDict[title] = stage
             # Don't recurse 'top', since it should only hold the directly passed process
-            if function := maybeGetFunction(stage) or isinstance(
-                stage, PipelineParameter
-            ):
-                self.addProcess(function or stage, top=False, force=force)
+            addDict = self.primitiveProcesses
+        if isinstance(process, PipelineFunction):
+            return sys.intern(process.title())
         return process.name()
 
     def addAllModuleProcesses(self, module: str | types.ModuleType, force=False):
+        with self.bulkAdd():
+            return self._addAllModuleProcesses(module, force)
+
+    def _addAllModuleProcesses(self, module: str | types.ModuleType, force=False):
         if isinstance(module, str):
             module = importlib.import_module(module)
 
         added = []
-        for name, process in inspect.getmembers(module):
-            if isinstance(process, PipelineStageType.__args__):
-                added.append(self.addProcess(process, force=force))
-                continue
-            if (
-                not hasattr(process, "__module__")
-                or process.__module__ != module.__name__
-            ):
+        stageTypes = _stageTypes
+        for member in self._moduleMembers(module):
+            title = None if force else self._moduleProcessTitles.get(member)
+            if title is not None and title in self.primitiveProcesses:
+                # Already registered from an earlier scan, so skip re-adding it
+                added.append(title)
                 continue
-            if inspect.isclass(process) and issubclass(
-                process, PipelineStageType.__args__
-            ):
+            process = member
+            if inspect.isclass(process) and issubclass(process, stageTypes):
                 try:
                     process = process()
                 except TypeError:
                     # Needs arguments
                     continue
-                added.append(self.addProcess(process, force=force))
-            elif callable(process):
-                added.append(self.addFunction(process, force=force))
+            if isinstance(process, stageTypes):
+                title = self._addProcess(process, force=force)
+            else:
+                title = self.addFunction(process, force=force)
+            added.append(title)
+            with contextlib.suppress(TypeError):
+                # Some callables can't be weakly referenced, and are always re-added
+                self._moduleProcessTitles[member] = title
         return added
 
+    def _moduleMembers(self, module: types.ModuleType):
+        """
+        Returns module members that can become processes: pipeline stages, stage
+        classes, and callables defined in ``module``. Results are cached per module
+        until its namespace changes, i.e. after ``importlib.reload``.
+        """
+        moduleName = module.__name__
+        namespace = vars(module)
+        snapshot = tuple(namespace)
+        cached = self._moduleMembersCache.get(module)
+        if (
+            cached is not None
+            and cached[0] == snapshot
+            and all(map(operator.is_, cached[1], namespace.values()))
+        ):
+            return cached[2]
+        members = []
+        stageTypes = _stageTypes
+        # `vars` avoids the repeated `getattr` calls of `inspect.getmembers`. Names are
+        # still sorted so processes register in the same order
+        for _name, process in sorted(namespace.items()):
+            if isinstance(process, stageTypes):
+                members.append(process)
+            elif getattr(process, "__module__", None) != moduleName:
+                continue
+            elif callable(process):
+                members.append(process)
+        self._moduleMembersCache[module] = (snapshot, tuple(namespace.values()), members)
+        return members
+
     def addFunction(self, func: t.Callable, top=False, force=False, **kwargs):
         """
         Helper function to wrap a function in a pipeline process and add it as a
@@ -329,7 +603,7 @@ class AlgorithmCollection(ParameterEditor):
 
         if proc is None:
             raise ValueError(f"Process `{processName}` not recognized")
-        if not isinstance(proc, PipelineStageType.__args__):
+        if not isinstance(proc, _stageTypes):
             raise ValueError(
                 f"Parsed `{processName}`, but got non-pipelinable result: {proc}"
             )
@@ -342,7 +616,7 @@ class AlgorithmCollection(ParameterEditor):
         if topFirst:
             searchDicts = searchDicts[::-1]
         proc = searchDicts[0].get(processName, searchDicts[1].get(processName))
-        if isinstance(proc, (type(None), *PipelineStageType.__args__)):
+        if isinstance(proc, _optionalStageTypes):
             return proc
         elif isinstance(proc, list):
             return self.pipelineFromStages(proc, name=processName, **kwargs)
@@ -378,7 +652,7 @@ class AlgorithmCollection(ParameterEditor):
             valueOpts, metaOpts = {}, {}
             if isinstance(stageName, dict):
                 stageName, valueOpts, metaOpts = _splitNameValueMetaDict(stageName)
-            stage = self.parseProcessName(stageName, topFirst=False)
+            stage = self.parseProcessName(sys.intern(stageName), topFirst=False)
             out.addStage(stage, stageInputOptions=valueOpts, **metaOpts)
 
         exists = out.name in self.topProcesses
@@ -394,12 +668,12 @@ class AlgorithmCollection(ParameterEditor):
         # otherwise they won't be rediscoverable after saving->restarting S3A
         for prefix in ["", *self.includeModules]:
             fullModuleName = ".".join([prefix, processName])
-            proc: t.Any = pydoc.locate(fullModuleName)
+            proc: t.Any = _locateCached(fullModuleName)
             if proc is not None:
                 break
 
         success = True
-        if inspect.isclass(proc) and issubclass(proc, PipelineStageType.__args__):
+        if inspect.isclass(proc) and issubclass(proc, _stageTypes):
             # False positive assuming only `object` return type
             # noinspection PyCallingNonCallable
             proc: PipelineStageType = proc(**kwargs)
@@ -425,15 +699,48 @@ class AlgorithmCollection(ParameterEditor):
         stateDict = self.stateManager.loadState(stateName, stateDict)
         top, primitive = stateDict.get("top", {}), stateDict.get("primitive", {})
         modules = stateDict.get("modules", [])
+        if modules != self.includeModules:
+            # Names that failed to resolve before may now be found in a new module
+            _locateCached.cache_clear()
         self.includeModules = modules
-        self.topProcesses.update(top)
-        self.primitiveProcesses.update(primitive)
+        self.topProcesses.update(_internKeys(top))
+        self.primitiveProcesses.update(_internKeys(primitive))
+        # Which stages are saved by reference depends on the primitive processes
+        self._invalidateStateCache()
         return super().loadParameterValues(stateName, candidateParameters=[], **kwargs)
 
+    def _invalidateStateCache(self):
+        self._stagesByReferenceCache.clear()
+        self._parameterValuesCache = None
+
+    def _onWatchedProcessChanged(self, *_args):
+        self._invalidateStateCache()
+
+    def _stagesByReferenceCached(self, name: str, process: PipelineParameter):
+        """
+        Returns ``saveStagesByReference(process)[name]``, reusing the last result until
+        ``process`` reports a change to its parameter tree
+        """
+        cached = self._stagesByReferenceCache.get(name)
+        if cached is None or cached[0] is not process:
+            if process not in self._watchedProcesses:
+                self._watchedProcesses.add(process)
+                process.sigTreeStateChanged.connect(self._onWatchedProcessChanged)
+            cached = (process, self.saveStagesByReference(process)[name])
+            self._stagesByReferenceCache[name] = cached
+        # Copy so callers can't alter the cached list
+        return list(cached[1])
+
     def getParameterValues(self):
+        if self._parameterValuesCache is None:
+            self._parameterValuesCache = self._computeParameterValues()
+        # Copy so callers can't alter the cached state
+        return _copyCollectionState(self._parameterValuesCache)
+
+    def _computeParameterValues(self):
         def converter(procDict):
             return {
-                name: self.saveStagesByReference(stage)[name]
+                name: self._stagesByReferenceCached(name, stage)
                 if isinstance(stage, PipelineParameter)
                 else stage
                 for name, stage in procDict.items()
@@ -453,16 +760,23 @@ class AlgorithmCollection(ParameterEditor):
         outState = dict(top={}, primitive={}, modules=self.includeModules)
 
         # Make sure to visit the most deeply nested stages first, so that stages
-        # can be accurately ignored if they are already included in a parent stage
-        visit = [process]
-        depths = defaultdict(int, {process: 0})
-        while visit:
-            pipe = visit.pop()
-            for child in filter(lambda el: isinstance(el, PipelineParameter), pipe):
-                depths[child] = max(depths[child], depths[pipe] + 1)
-                visit.append(child)
-
-        for pipe in sorted(depths, key=depths.get, reverse=True):
+        # can be accurately ignored if they are already included in a parent stage.
+        # A post-order traversal guarantees every child precedes its parent
+        order: list[tuple[PipelineParameter, list[bool]]] = []
+        seen: set[int] = set()
+
+        def postorder(pipe: PipelineParameter):
+            # Record which children are pipelines so they aren't re-checked below
+            isPipeline = [isinstance(child, PipelineParameter) for child in pipe]
+            for child, childIsPipeline in zip(pipe, isPipeline):
+                if childIsPipeline and id(child) not in seen:
+                    postorder(child)
+            seen.add(id(pipe))
+            order.append((pipe, isPipeline))
+
+        postorder(process)
+
+        for pipe, isPipeline in order:
             # Don't record meta changes for top process since it breaks
             # logic for loading from a collection.
             # Do this by only keeping the first key (non-meta information)
@@ -472,10 +786,10 @@ class AlgorithmCollection(ParameterEditor):
             # Since all nested pipelines are already recorded, disregard
             # kwargs propagated from them. Avoids info duplication
             children = [
-                chState
-                if not isinstance(ch, PipelineParameter) or isinstance(chState, str)
-                else _peekFirst(chState)
-                for ch, chState in zip(pipe, children)
+                _peekFirst(chState)
+                if chIsPipeline and not isinstance(chState, str)
+                else chState
+                for chIsPipeline, chState in zip(isPipeline, children)
             ]
             dest = "top" if pipe is process else "primitive"
             outState[dest][title] = children
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import typing as t
+from collections import deque
 from contextlib import ExitStack
 from pathlib import Path
 
@@ -25,6 +27,50 @@ if t.TYPE_CHECKING:
 _UNSET_NAME = object()
 
 
+@functools.cache
+def _resolveMenuTitle(menuTitle: str | None, name: str | None, ensureShortcut: bool):
+    name = menuTitle or name
+    if ensureShortcut and "&" not in name:
+        name = f"&{name}"
+    return name
+
+
+_activeConnectionQueue: deque[tuple[t.Any, t.Callable]] | None = None
+
+
+@contextlib.contextmanager
+def connectionQueue():
+    """
+    Defers signal connections made through :func:`deferConnection` until the context
+    exits, at which point they are made in one pass in the order they were requested.
+    Useful when many plugins are attached at once, e.g. during window startup.
+    Nested contexts share the outermost queue.
+    """
+    global _activeConnectionQueue
+    if _activeConnectionQueue is not None:
+        yield _activeConnectionQueue
+        return
+    queue = _activeConnectionQueue = deque()
+    try:
+        yield queue
+    finally:
+        _activeConnectionQueue = None
+        while queue:
+            signal, slot = queue.popleft()
+            signal.connect(slot)
+
+
+def deferConnection(signal, slot: t.Callable):
+    """
+    Connects ``slot`` to ``signal``, postponing the connection if a
+    :func:`connectionQueue` is active.
+    """
+    if _activeConnectionQueue is None:
+        signal.connect(slot)
+    else:
+        _activeConnectionQueue.append((signal, slot))
+
+
 class ParameterEditorPlugin(ParameterEditor):
     window: S3A = None
     directoryParent: str | None = MENU_OPTS_DIR
@@ -43,10 +89,14 @@ class ParameterEditorPlugin(ParameterEditor):
         """
         pass
 
+    @classmethod
+    @functools.cache
+    def _defaultName(cls):
+        return fns.nameFormatter(cls.name or cls.__name__.replace("Plugin", ""))
+
     def __init__(self, *, name: str = None, directory: str = None, **kwargs):
-        defaultName = self.name or self.__class__.__name__.replace("Plugin", "")
         if name is None:
-            name = fns.nameFormatter(defaultName)
+            name = self._defaultName()
         if directory is None and self.directoryParent is not None:
             directory = Path(self.directoryParent) / name.lower()
         super().__init__(name=name, directory=directory)
@@ -108,10 +158,7 @@ class ParameterEditorPlugin(ParameterEditor):
         return function
 
     def _resolveMenuTitle(self, name: str = None, ensureShortcut=True):
-        name = self.menuTitle or name
-        if ensureShortcut and "&" not in name:
-            name = f"&{name}"
-        return name
+        return _resolveMenuTitle(self.menuTitle, name, ensureShortcut)
 
     @contextlib.contextmanager
     def sharedDefaultParentContext(self, name: str = None):
@@ -206,13 +253,19 @@ class TableFieldPlugin(ProcessorPlugin):
     _makeMenuShortcuts = False
 
     def attachToWindow(self, window: S3A):
+        # Activation hooks are skipped until a window exists, so they only ran already
+        # if this plugin was active while attached
+        hooksActive = self._active and self.window is not None
         super().attachToWindow(window)
         self.mainImage = window.mainImage
         self.componentManager = window.componentManager
-        window.sigRegionAccepted.connect(self.acceptChanges)
-        self.componentManager.sigUpdatedFocusedComponent.connect(
-            self.updateFocusedComponent
+        deferConnection(window.sigRegionAccepted, self.acceptChanges)
+        deferConnection(
+            self.componentManager.sigUpdatedFocusedComponent,
+            self.updateFocusedComponent,
         )
+        if not hooksActive:
+            self._active = False
         self.active = True
         self.registerFunction(
             self.processorAnalytics, runActionTemplate=PRJ_CONSTS.TOOL_PROC_ANALYTICS
@@ -252,6 +305,11 @@ class TableFieldPlugin(ProcessorPlugin):
     def active(self, newActive: bool):
         if newActive == self._active:
             return
+        if self.window is None:
+            # Activation hooks rely on window resources, so only record the state
+            # until this plugin is attached
+            self._active = newActive
+            return
         if newActive:
             self._onActivate()
         else:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import functools
 import inspect
 import os
@@ -30,7 +31,13 @@ from ..constants import (
     PROJECT_FILE_TYPE,
     REQD_TBL_FIELDS,
 )
-from ..generalutils import cvImsaveRgb, getMaybeReplaceKey, hierarchicalUpdate
+from ..generalutils import (
+    MaxSizeDict,
+    cvImsaveRgb,
+    getMaybeReplaceKey,
+    hierarchicalUpdate,
+    saveYamlBuffered,
+)
 from ..graphicsutils import DropList
 from ..logger import getAppLogger
 from ..processing import PipelineFunction
@@ -48,6 +55,19 @@ def absolutePath(p: Optional[Path]):
     return Path(os.path.abspath(p))
 
 
+@functools.lru_cache(maxsize=4)
+def _parseTemplateConfig(templateName: FilePath) -> dict:
+    return fns.attemptFileLoad(templateName) or {}
+
+
+def loadTemplateConfig(templateName: FilePath) -> dict:
+    """
+    Project templates ship with s3a and don't change at runtime, so they are only
+    parsed once. A copy is returned since callers update the config in place
+    """
+    return copy.deepcopy(_parseTemplateConfig(templateName))
+
+
 class FilePlugin(CompositionMixin, ParameterEditorPlugin):
     name = "File"
 
@@ -277,7 +297,7 @@ class FilePlugin(CompositionMixin, ParameterEditorPlugin):
 
     def save(self):
         self.window.saveCurrentAnnotation()
-        self.projectData.saveConfig()
+        self.projectData.saveConfig(sync=True)
         getAppLogger(__name__).attention("Saved project")
 
     @bind(
@@ -621,12 +641,34 @@ class ProjectData(QtCore.QObject):
         self.tableData = TableData()
         self.componentIo = ComponentIO(self.tableData)
         self.templateName = PROJECT_BASE_TEMPLATE
-        self.config = fns.attemptFileLoad(self.templateName)
+        self.config = loadTemplateConfig(self.templateName)
         self.configPath: Optional[Path] = None
         self.images: List[Path] = []
         self.imageFolders: Set[Path] = set()
+        self._imagePartsIndex: Optional[Dict[Tuple[str, ...], List[Path]]] = None
+        """
+        Maps every trailing sequence of path components to the images ending with it.
+        Built lazily and reset whenever ``images`` changes
+        """
+        self._resolvedPaths: Dict[Path, Path] = MaxSizeDict(maxsize=4096)
+        """
+        ``Path.resolve`` hits the filesystem for every path component, so absolute
+        image paths are resolved once until this project's images are cleared
+        """
         self.imageAnnotationMap: Dict[Path, Path] = {}
         """Records annotations belonging to each image"""
+        self.annotationImageMap: Dict[Path, Path] = {}
+        """Reverse of ``imageAnnotationMap``, used for constant-time annotation lookup"""
+        self._annotationCache: Dict[Path, Tuple[float, pd.DataFrame]] = {}
+        """
+        Maps annotation files to their last known modification time and contents, so
+        appending to an annotation doesn't re-parse the file each time
+        """
+        self._stemAnnotationIndex: Dict[str, List[Path]] = {}
+        """
+        Maps image stems to every annotation file written for them, so removing an
+        image doesn't require scanning the annotations directory
+        """
         self.spawnedPlugins: List[ParameterEditorPlugin] = []
         """
         Plugin instances stored separately from plugin-config to maintain serializability
@@ -635,6 +677,10 @@ class ProjectData(QtCore.QObject):
 
         self._suppressSignals = False
         """If this is *True*, no signals will be emitted """
+        self._batchDepth = 0
+        """While nonzero, config writes are deferred until the outermost batch exits"""
+        self._configDirty = False
+        self._syncPending = False
         self.watcher = QtCore.QFileSystemWatcher()
         self.watcher.directoryChanged.connect(self._handleLocationChange)
 
@@ -660,13 +706,14 @@ class ProjectData(QtCore.QObject):
                 delImgs.append(img)
         for idx in delIdxs:
             del self.images[idx]
+        self._imagePartsIndex = None
         self.sigImagesRemoved.emit(delImgs)
 
         anns = list(self.annotationsPath.glob(f'*.{self.config["annotation-format"]}'))
         # Images already in the project will be ignored on add
         # Assume new annotations here are already formatted properly
         for ann in anns:
-            if ann not in self.imageAnnotationMap.values():
+            if ann not in self.annotationImageMap:
                 self.addFormattedAnnotation(ann)
         # Convert to list to avoid "dictionary changed size on iteration" error
         for ann in list(self.imageAnnotationMap.values()):
@@ -695,8 +742,17 @@ class ProjectData(QtCore.QObject):
 
     def clearImagesAndAnnotations(self):
         oldImgs = self.images.copy()
-        for lst in self.images, self.imageAnnotationMap, self.imageFolders:
+        for lst in (
+            self.images,
+            self.imageAnnotationMap,
+            self.annotationImageMap,
+            self._annotationCache,
+            self.imageFolders,
+            self._stemAnnotationIndex,
+        ):
             lst.clear()
+        self._imagePartsIndex = None
+        self._resolvedPaths.clear()
         self._maybeEmit(self.sigImagesRemoved, oldImgs)
 
     def loadConfig(self, configPath: FilePath, configDict: dict = None, force=False):
@@ -716,7 +772,7 @@ class ProjectData(QtCore.QObject):
             If *True*, the new config will be loaded even if it is the same name
             as the current config
         """
-        _, baseCfgDict = fns.resolveYamlDict(self.templateName)
+        baseCfgDict = loadTemplateConfig(self.templateName)
         configPath, configDict = fns.resolveYamlDict(configPath, configDict)
         configPath = absolutePath(configPath)
         if not force and self.configPath == configPath:
@@ -852,24 +908,31 @@ class ProjectData(QtCore.QObject):
         parent.saveConfig()
         return parent
 
-    def saveConfig(self, copyMissingItems=False):
+    def saveConfig(self, copyMissingItems=False, sync=False):
         """
         Saves the config file, optionally copying missing items to the project location
         as well. "Missing items" are images and annotations in base folders / existing
-        in the project config but not in the actual project directory
+        in the project config but not in the actual project directory. If ``sync`` is
+        *True*, the config is flushed to disk before returning.
         """
         if copyMissingItems:
-            for image in self._findMissingImages():
-                self.addImageByPath(image)
-            for annotation in self._findMissingAnnotations():
-                self.addAnnotationByPath(annotation)
+            with self.batch():
+                for image in self._findMissingImages():
+                    self.addImageByPath(image)
+                for annotation in self._findMissingAnnotations():
+                    self.addAnnotationByPath(annotation)
+        if self._batchDepth:
+            self._configDirty = True
+            self._syncPending = self._syncPending or sync
+            return
 
         tblName = Path(self.tableData.configPath).absolute()
         if tblName != self.configPath:
             if tblName.parent == self.location:
                 tblName = tblName.name
             self.config["table-config"] = str(tblName)
-        fns.saveToFile(self.config, self.configPath)
+        saveYamlBuffered(self.config, self.configPath, sync=sync)
+        self._configDirty = self._syncPending = False
 
     def _findMissingAnnotations(self):
         annDir = self.annotationsPath
@@ -954,10 +1017,12 @@ class ProjectData(QtCore.QObject):
             fullName = self.imagesPath / fullName
         if copyToProject or data is not None:
             fullName = self._copyImageToProject(fullName, data, allowOverwrite)
-        if fullName.name in [i.name for i in self.images]:
+        if (fullName.name,) in self._getImagePartsIndex():
             # Indicate the image was already present to calling scope
             return None
         self.images.append(fullName)
+        # Appending is common during folder adds, so update instead of rebuilding
+        self._indexImageParts(self._getImagePartsIndex(), fullName)
         self._maybeEmit(self.sigImagesAdded, [fullName])
         return fullName
         # TODO: Create less hazardous undo operation
@@ -985,6 +1050,7 @@ class ProjectData(QtCore.QObject):
             del self.images[oldIdx]
         else:
             self.images[oldIdx] = newName
+        self._imagePartsIndex = None
         self._maybeEmit(self.sigImagesMoved, [(oldName, newName)])
 
     def addImageFolder(self, folder: FilePath, copyToProject=True):
@@ -995,9 +1061,12 @@ class ProjectData(QtCore.QObject):
         # images. If an added image already existed in the project, it won't be added.
         # Also, if the images are copied into the project, the paths will change.
         addedImgs = []
-        with self.suppressSignals():
-            for img in folder.glob("*.*"):
-                finalName = self.addImage(img, copyToProject=copyToProject)
+        # `scandir` entries cache their file type, avoiding a `stat` per glob match
+        with self.suppressSignals(), self.batch(), os.scandir(folder) as entries:
+            for entry in entries:
+                if "." not in entry.name or not entry.is_file():
+                    continue
+                finalName = self.addImage(Path(entry.path), copyToProject=copyToProject)
                 if finalName is not None:
                     addedImgs.append(finalName)
         self._maybeEmit(self.sigImagesAdded, addedImgs)
@@ -1037,10 +1106,11 @@ class ProjectData(QtCore.QObject):
         if imageName not in self.images:
             return
         self.images.remove(imageName)
+        self._imagePartsIndex = None
         # Remove copied annotations for this image
-        for ann in self.annotationsPath.glob(f"{imageName.stem}.*"):
-            ann.unlink()
-        self.imageAnnotationMap.pop(imageName, None)
+        for ann in self._stemAnnotationIndex.pop(imageName.stem, ()):
+            ann.unlink(missing_ok=True)
+        self.annotationImageMap.pop(self.imageAnnotationMap.pop(imageName, None), None)
         self._maybeEmit(self.sigImagesRemoved, [imageName])
         if imageName.parent == self.imagesPath:
             imageName.unlink()
@@ -1059,14 +1129,13 @@ class ProjectData(QtCore.QObject):
 
     def removeAnnotation(self, annotationName: FilePath):
         annotationName = absolutePath(annotationName)
-        # Since no mapping exists of all annotations, loop the long way until the file
-        # is found
-        for key, ann in list(self.imageAnnotationMap.items()):
-            if annotationName == ann:
-                del self.imageAnnotationMap[key]
-                ann.unlink(missing_ok=True)
-                self._maybeEmit(self.sigAnnotationsRemoved, [ann])
-                break
+        self._annotationCache.pop(annotationName, None)
+        image = self.annotationImageMap.pop(annotationName, None)
+        if image is None:
+            return
+        del self.imageAnnotationMap[image]
+        annotationName.unlink(missing_ok=True)
+        self._maybeEmit(self.sigAnnotationsRemoved, [annotationName])
 
     def addAnnotation(
         self,
@@ -1078,7 +1147,7 @@ class ProjectData(QtCore.QObject):
         # Housekeeping for default arguments
         if name is None and data is None:
             raise IOError("`name` and `data` cannot both be `None`")
-        elif name in self.imageAnnotationMap.values() and not overwriteOld:
+        elif name in self.annotationImageMap and not overwriteOld:
             # Already present, shouldn't be added
             return
         if data is None:
@@ -1106,7 +1175,7 @@ class ProjectData(QtCore.QObject):
         annForImg = self.imageAnnotationMap.get(image, None)
         oldAnns = []
         if annForImg is not None and not overwriteOld:
-            oldAnns.append(self.componentIo.importByFileType(annForImg))
+            oldAnns.append(self._readAnnotation(annForImg))
         combinedAnns = oldAnns + [data]
         outAnn = pd.concat(combinedAnns, ignore_index=True)
         outAnn[REQD_TBL_FIELDS.ID] = outAnn.index
@@ -1118,11 +1187,22 @@ class ProjectData(QtCore.QObject):
             self.componentIo.exportByFileType(
                 outAnn, outName, verifyIntegrity=False, readonly=False
             )
-            self.imageAnnotationMap[image] = outName
+            # Only formats that survive a round trip can skip re-reading
+            if outFmt[1:] in self.componentIo.roundTripTypes:
+                self._annotationCache[outName] = (outName.stat().st_mtime, outAnn)
+            self._recordAnnotation(image, outName)
             self._maybeEmit(self.sigAnnotationsAdded, [outName])
         elif outName.exists():
             self.removeAnnotation(outName)
 
+    def _readAnnotation(self, annotation: Path):
+        mtime = annotation.stat().st_mtime
+        cached = self._annotationCache.get(annotation)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self.componentIo.importByFileType(annotation))
+            self._annotationCache[annotation] = cached
+        return cached[1]
+
     def addFormattedAnnotation(self, file: FilePath, overwriteOld=False):
         """
         Adds an annotation file that is already formatted in the following ways:
@@ -1142,7 +1222,17 @@ class ProjectData(QtCore.QObject):
             newName = self.annotationsPath / file.name
             shutil.copy2(file, newName)
             file = newName
-        self.imageAnnotationMap[image] = file
+        self._recordAnnotation(image, file)
+
+    def _recordAnnotation(self, image: Path, annotation: Path):
+        oldAnnotation = self.imageAnnotationMap.get(image)
+        if oldAnnotation is not None:
+            self.annotationImageMap.pop(oldAnnotation, None)
+        self.imageAnnotationMap[image] = annotation
+        self.annotationImageMap[annotation] = image
+        annotations = self._stemAnnotationIndex.setdefault(image.stem, [])
+        if annotation not in annotations:
+            annotations.append(annotation)
 
     def _copyImageToProject(self, name: Path, data: NChanImg = None, overwrite=False):
         newName = self.imagesPath / name.name
@@ -1150,7 +1240,9 @@ class ProjectData(QtCore.QObject):
             # Already in the project, no need to copy
             return newName
         if name.exists() and data is None:
-            shutil.copy(name, newName)
+            # `copyfile` already uses zero-copy `os.sendfile` where available, and skips
+            # the extra `chmod` performed by `shutil.copy`
+            shutil.copyfile(name, newName)
         elif data is not None:
             # Programmatically created or not from a local file
             # noinspection PyTypeChecker
@@ -1165,6 +1257,19 @@ class ProjectData(QtCore.QObject):
             self._maybeEmit(self.sigImagesMoved, [(name, newName)])
         return newName
 
+    def _getImagePartsIndex(self):
+        if self._imagePartsIndex is None:
+            self._imagePartsIndex = {}
+            for img in self.images:
+                self._indexImageParts(self._imagePartsIndex, img)
+        return self._imagePartsIndex
+
+    @staticmethod
+    def _indexImageParts(index: dict, image: Path):
+        parts = image.parts
+        for ii in range(1, len(parts) + 1):
+            index.setdefault(parts[-ii:], []).append(image)
+
     def getFullImgName(self, name: FilePath, thorough=True):
         """
         From an absolute or relative image name, attempts to find the absolute path it
@@ -1188,23 +1293,17 @@ class ProjectData(QtCore.QObject):
         name = Path(name)
         if name.is_absolute():
             # Ok to call 'resolve', since relative paths are the ones with issues.
-            return name.resolve()
+            resolved = self._resolvedPaths.get(name)
+            if resolved is None:
+                resolved = self._resolvedPaths[name] = name.resolve()
+            return resolved
 
         candidates = set()
-        strName = str(name)
-        # Compare using "endswith" when folder names are included, otherwise a direct
-        # analysis of the name is preferred
-        if strName == name.name:
-            compare = lambda strName, selfImageName: strName == selfImageName.name
-        else:
-            compare = lambda strName, selfImageName: str(selfImageName).endswith(
-                strName
-            )
-        for img in self.images:
-            if compare(strName, img):
-                if not thorough:
-                    return img
-                candidates.add(img)
+        # Project images whose trailing path components match `name`
+        for img in self._getImagePartsIndex().get(name.parts, ()):
+            if not thorough:
+                return img
+            candidates.add(img)
 
         for parent in self.imageFolders:
             curName = parent / name
@@ -1328,5 +1427,19 @@ class ProjectData(QtCore.QObject):
         yield
         self._suppressSignals = oldSuppress
 
+    @contextmanager
+    def batch(self):
+        """
+        Defers ``saveConfig`` calls until the outermost batch exits, so many project
+        mutations result in at most one config write
+        """
+        self._batchDepth += 1
+        try:
+            yield
+        finally:
+            self._batchDepth -= 1
+        if not self._batchDepth and self._configDirty:
+            self.saveConfig(sync=self._syncPending)
+
     def __reduce__(self):
         return ProjectData, (self.configPath, self.config)
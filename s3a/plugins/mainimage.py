@@ -24,6 +24,11 @@ class MainImagePlugin(ParameterEditorPlugin):
     createProcessMenu = False
     tableData: TableData
 
+    _clipMax: np.ndarray | None = None
+    """Upper (x, y) bounds for drawn vertices, refreshed when the image changes"""
+    _verticesBuffer: np.ndarray | None = None
+    """Reusable integer buffer for clipped ROI vertices"""
+
     def __initSharedSettings__(self, shared: SharedAppSettings = None, **kwargs):
         self.props = ParameterContainer()
         shared.generalProperties.registerParameter(
@@ -50,6 +55,7 @@ class MainImagePlugin(ParameterEditorPlugin):
         self._hookupCopier(window)
         self._hookupDrawActions(window)
         self._hookupSelectionTools(window)
+        window.mainImage.imageItem.sigImageChanged.connect(self._updateClipBounds)
 
         collection = window.mainImage.addTools(self)
         # "self" doesn't have a gui component, so if shortcuts aren't reassigned to
@@ -62,33 +68,35 @@ class MainImagePlugin(ParameterEditorPlugin):
     def _hookupDrawActions(self, window):
         disp = window.componentController
 
+        editActions = frozenset((CNST.DRAW_ACT_REM, CNST.DRAW_ACT_ADD))
+        # Selections aren't retained, so point selections can share one buffer
+        pointMean = np.empty((1, 2), dtype=float)
+
         def actHandler(verts, param):
-            activeEdits = (
-                len(self.window.verticesPlugin.region.regionData["Vertices"]) > 0
-            )
-            if (
-                param in [CNST.DRAW_ACT_REM, CNST.DRAW_ACT_ADD]
-                and not activeEdits
-                and self.window.componentController.selectionIntersectsRegion(verts)
-            ):
-                warnings.warn(
-                    "Made a selection on top of an existing component. It is ambiguous"
-                    " whether the existing component should be selected or a new"
-                    " component should be created on top. Use either 'Select' or"
-                    " 'Create' action first",
-                    UserWarning,
-                    stacklevel=2,
-                )
-                return
-            elif param in [CNST.DRAW_ACT_REM, CNST.DRAW_ACT_ADD] and activeEdits:
-                # Don't make selection if edits are already in progress
-                return
+            # Select and pan are the most frequent actions and never need the
+            # region or intersection checks below
+            if param in editActions:
+                if self.window.verticesPlugin.hasActiveEdits:
+                    # Don't make selection if edits are already in progress
+                    return
+                if self.window.componentController.selectionIntersectsRegion(verts):
+                    warnings.warn(
+                        "Made a selection on top of an existing component. It is "
+                        "ambiguous whether the existing component should be selected "
+                        "or a new component should be created on top. Use either "
+                        "'Select' or 'Create' action first",
+                        UserWarning,
+                        stacklevel=2,
+                    )
+                    return
             # Special case: Selection with point shape should be a point
             if (
                 self.window.mainImage.shapeCollection.shapeParameter
                 == CNST.DRAW_SHAPE_POINT
             ):
-                verts = verts.mean(0, keepdims=True)
+                np.sum(verts, axis=0, out=pointMean[0])
+                pointMean /= len(verts)
+                verts = pointMean
             disp.reflectSelectionBoundsMade(verts)
 
         acts = [
@@ -97,9 +105,14 @@ class MainImagePlugin(ParameterEditorPlugin):
             CNST.DRAW_ACT_SELECT,
             CNST.DRAW_ACT_PAN,
         ]
-        window.mainImage.registerDrawAction(acts, actHandler)
-        # Create checks an edge case for selection, so no need to add to above acts
-        window.mainImage.registerDrawAction(CNST.DRAW_ACT_CREATE, self.createComponent)
+        window.mainImage.registerDrawActions(
+            [
+                (acts, actHandler),
+                # Create checks an edge case for selection, so no need to add to
+                # above acts
+                (CNST.DRAW_ACT_CREATE, self.createComponent),
+            ]
+        )
 
     def _hookupCopier(self, window):
         mainImage = window.mainImage
@@ -168,14 +181,49 @@ class MainImagePlugin(ParameterEditorPlugin):
     def image(self):
         return self.window.mainImage.image
 
+    def _updateClipBounds(self):
+        image = self.image
+        if image is None:
+            self._clipMax = None
+        else:
+            self._clipMax = np.array(image.shape[1::-1], dtype=np.int32)
+
+    def _clipVertices(self, roiVertices: XYVertices) -> XYVertices:
+        """
+        Clips ``roiVertices`` to the image bounds, keeping their ``connected``
+        attribute. The result is a view into a buffer that is reused across calls, so
+        it must be copied if it should persist.
+        """
+        if self._clipMax is None:
+            self._updateClipBounds()
+        numVerts = len(roiVertices)
+        if self._verticesBuffer is None or len(self._verticesBuffer) < numVerts:
+            self._verticesBuffer = np.empty((max(numVerts * 2, 16), 2), np.int32)
+        verts = self._verticesBuffer[:numVerts].view(XYVertices)
+        verts.connected = getattr(roiVertices, "connected", True)
+        np.clip(roiVertices, 0, self._clipMax, out=verts, casting="unsafe")
+        return verts
+
+    def _isBelowMinimumSize(self, verts: np.ndarray):
+        minSize = self.props[CNST.PROP_MIN_COMP_SZ]
+        # Areas are never negative, and fewer than three vertices enclose no area, so
+        # both cases are known without computing the contour area
+        if minSize <= 0:
+            return False
+        if len(verts) < 3:
+            return True
+        return cv.contourArea(verts) < minSize
+
     def createComponent(self, roiVertices: XYVertices):
-        verts = np.clip(roiVertices.astype(int), 0, self.image.shape[:2][::-1])
+        verts = self._clipVertices(roiVertices)
 
-        if cv.contourArea(verts) < self.props[CNST.PROP_MIN_COMP_SZ]:
+        if self._isBelowMinimumSize(verts):
             # Use as selection instead of creation
             self.window.componentController.reflectSelectionBoundsMade(roiVertices[[0]])
             return
 
+        # ``simplify`` always returns new arrays, so the result is safely detached from
+        # the reusable vertices buffer
         verts = ComplexXYVertices([verts]).simplify(
             self.window.verticesPlugin.props[CNST.PROP_REG_APPROX_EPS]
         )
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 import typing as t
 import warnings
 from collections import deque, namedtuple
@@ -42,6 +41,9 @@ class _REG_ACCEPTED:
 
 buffEntry = namedtuple("buffentry", "id_ vertices")
 
+_VIEWBOX_CORNERS = np.array([[0, 0], [0, 1], [1, 1], [1, 0]])
+"""Multiplied by a span and shifted by an offset to give viewbox corners"""
+
 
 class VerticesPlugin(DASM, TableFieldPlugin):
     def __initSharedSettings__(self, shared: SharedAppSettings = None, **kwargs):
@@ -76,6 +78,13 @@ class VerticesPlugin(DASM, TableFieldPlugin):
 
         self.oldResultCache = None
         """Holds the last result from a region run so undoables reset the process cache"""
+        self._scratch = np.empty((0, 0), "uint8")
+        self._displayableInfosCache: tuple[list, list, dict] = ([], [], {})
+        self._regionGrayscaleCache: tuple[int, tuple, np.ndarray] = (
+            -1,
+            (),
+            np.zeros((0, 0), "uint16"),
+        )
 
         self.processEditor.registerFunction(
             self.overlayStageInfo,
@@ -91,9 +100,8 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         window.mainImage.addItem(self.stageInfoImage)
 
         def resetRegBuff(_, newSize):
-            newBuff = deque(maxlen=newSize)
-            newBuff.extend(self.regionBuffer)
-            self.regionBuffer = newBuff
+            if newSize != self.regionBuffer.maxlen:
+                self.regionBuffer = deque(self.regionBuffer, maxlen=newSize)
 
         mainBufSize = window.props.parameters["maxLength"]
         mainBufSize.sigValueChanged.connect(resetRegBuff)
@@ -136,9 +144,20 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         """Completely fill the focused region mask"""
         if self.componentManager.focusedComponent is None:
             return
-        filledImg = np.ones(self.mainImage.image.shape[:2], dtype="uint16")
+        filledImg = self._scratchMask(self.mainImage.image.shape[:2])
+        filledImg.fill(1)
         self.updateRegionFromMask(filledImg)
 
+    def _scratchMask(self, shape: tuple[int, ...]):
+        """
+        Returns a reusable uint8 mask of the requested shape, which is what contour
+        detection consumes. Contents are undefined, and the mask must not be kept
+        since later calls overwrite it
+        """
+        if self._scratch.shape != shape:
+            self._scratch = np.empty(shape, "uint8")
+        return self._scratch
+
     @classmethod
     def clearProcessorHistory(cls):
         """
@@ -146,23 +165,32 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         past edits into account when performing their operations. Clearing that history
         will erase algorithm knowledge of past edits.
         """
-        imageproc.procCache["mask"] = np.zeros_like(imageproc.procCache["mask"])
+        mask = imageproc.procCache["mask"]
+        # Undo entries hold shallow copies of the cache that share this array, so it
+        # is replaced rather than zeroed in place. Nothing to do if already cleared
+        if mask.any():
+            imageproc.procCache["mask"] = np.zeros_like(mask)
 
     def updateFocusedComponent(self, component: pd.Series = None):
-        if self.componentManager.focusedComponent[RTF.ID] == -1:
+        oldId = self.componentManager.focusedComponent[RTF.ID]
+        if oldId == -1:
             self.updateRegionFromDf(None)
             return
-        oldId = self.componentManager.focusedComponent[RTF.ID]
         self.updateRegionFromDf(self.componentManager.focusedDataframe)
         if component is None or oldId != component[RTF.ID]:
             self.firstRun = True
 
+    @property
+    def hasActiveEdits(self):
+        """Whether the editable region currently holds any vertices"""
+        # The frame length is known without building a column series
+        return len(self.region.regionData) > 0
+
     def runFromDrawAction(self, verts: XYVertices, param: OptionsDict):
         # noinspection PyTypeChecker
         verts: XYVertices = verts.astype(int)
-        activeEdits = len(self.region.regionData["Vertices"]) > 0
         if (
-            not activeEdits
+            not self.hasActiveEdits
             and self.window.componentController.selectionIntersectsRegion(verts)
         ):
             # Warning already handled by main image
@@ -192,8 +220,13 @@ class VerticesPlugin(DASM, TableFieldPlugin):
     def updateTaskLabel(self):
         if not self.statusButton:
             return
-        active = sum([th.isRunning() for th in self.taskManager.threads])
-        pending = len(self.taskManager.threads) - active
+        manager = self.taskManager
+        # Threads are only started from the front of the queue and removed once they
+        # finish, so running threads are always among the first few
+        active = sum(
+            th.isRunning() for th in manager.threads[: manager.maxConcurrentThreads]
+        )
+        pending = len(manager.threads) - active
         if active or pending:
             self.statusButton.setText(f"{active} active, {pending} pending action(s)")
         else:
@@ -229,36 +262,52 @@ class VerticesPlugin(DASM, TableFieldPlugin):
             warnings.warn(str(ex), UserWarning, stacklevel=2)
 
     def updateGuiFromProcessor(self, procResult: dict | np.ndarray):
-        img = self.mainImage.image
-        if img is None:
-            compGrayscale = None
-        else:
-            compGrayscale = self.region.toGrayImage(img.shape[:2])
-
         newGrayscale = procResult
         if isinstance(newGrayscale, dict):
             newGrayscale = newGrayscale["image"]
         elif newGrayscale is None:
             # No change
             return
-        newGrayscale = newGrayscale.astype("uint8")
+        newGrayscale = newGrayscale.astype("uint8", copy=False)
 
-        matchNames = [
-            stage.title() for stage in self.currentProcessor.flattenedFunctions()
-        ]
-        if self._displayedStage in matchNames:
-            self.overlayStageInfo(self._displayedStage, self.stageInfoImage.opacity())
-        else:
-            self.stageInfoImage.hide()
+        # Stages missing from the current processor have no info, which hides the
+        # overlay. So there's no need to look up stage names separately
+        self.overlayStageInfo(self._displayedStage, self.stageInfoImage.opacity())
         # Can't set limits to actual infos since equality comparison fails in pyqtgraph
         # setLimits
         limits = [""] + list(self.getDisplayableInfos())
         self.props.parameters["info"].setLimits(limits)
 
         self.firstRun = False
-        if not np.array_equal(newGrayscale, compGrayscale):
+        if not self._matchesRegionMask(newGrayscale):
             self.updateRegionFromMask(newGrayscale)
 
+    def _matchesRegionMask(self, grayscale: np.ndarray):
+        """
+        Whether ``grayscale`` is identical to the current region mask. Cheap checks run
+        first so the region is only rasterized when a full comparison is needed
+        """
+        img = self.mainImage.image
+        if img is None or grayscale.shape != img.shape[:2]:
+            return False
+        if not self.hasActiveEdits:
+            # An empty region rasterizes to all zeros
+            return not grayscale.any()
+        return np.array_equal(grayscale, self._regionGrayscale(img.shape[:2]))
+
+    def _regionGrayscale(self, imageShape: tuple[int, ...]):
+        """
+        Rasterized region labels, reused until the region data changes (see
+        ``MultiRegionPlot.dataVersion``) or a different shape is requested. The result
+        is shared, so it must not be modified
+        """
+        version, shape, grayscale = self._regionGrayscaleCache
+        if version != self.region.dataVersion or shape != imageShape:
+            version = self.region.dataVersion
+            grayscale = self.region.toGrayImage(imageShape)
+            self._regionGrayscaleCache = (version, imageShape, grayscale)
+        return grayscale
+
     def run(
         self,
         foregroundVertices: XYVertices = None,
@@ -277,8 +326,7 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         if img is None:
             compMask = None
         else:
-            compGrayscale = self.region.toGrayImage(img.shape[:2])
-            compMask = compGrayscale > 0
+            compMask = self._regionGrayscale(img.shape[:2]) > 0
         # TODO: When multiple classes can be represented within focused image, this is
         #  where change will have to occur
         viewbox = self.mainImage.viewboxCoords()
@@ -354,12 +402,15 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         # 0-center new vertices relative to FocusedImage image
         centeredData = newData
         if np.any(offset != 0):
-            # Make a deep copy of vertices (since they change) to preserve redos
+            # ``applyOffset`` writes into new arrays, so the original vertices are
+            # left untouched for redos
             centeredData = centeredData.copy()
             centeredData[RTF.VERTICES] = self.applyOffset(
-                [copy.deepcopy(v) for v in newData[RTF.VERTICES]], offset
+                list(newData[RTF.VERTICES]), offset
             )
-        if oldData.equals(centeredData):
+        # ``equals`` compares axes before values, so frames with different ids or
+        # columns are rejected without comparing vertices
+        if centeredData is oldData or oldData.equals(centeredData):
             return
 
         lblCol = self.window.componentController.labelColumn
@@ -392,11 +443,9 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         #  where change will have to occur
         stacked = verts.stack()
         offset = stacked.min(axis=0)
-        if len(stacked) > 1:
-            span = np.ptp(stacked, axis=0).flatten()
-        else:
-            span = np.array([0, 0], dtype=int)
-        viewbox = span * np.array([[0, 0], [0, 1], [1, 1], [1, 0]]) + offset
+        # A single vertex naturally gives a zero span
+        span = stacked.max(axis=0) - offset
+        viewbox = span * _VIEWBOX_CORNERS + offset
         oldProcCache = imageproc.procCache.copy()
         # Broad range of things that can go wrong
         # noinspection PyBroadException
@@ -404,9 +453,9 @@ class VerticesPlugin(DASM, TableFieldPlugin):
             foregroundVertices=XYVertices(), backgroundVertices=XYVertices()
         )
         if verticesAs == "foreground":
-            vertsArgs["foregroundVertices"] = verts.stack()
+            vertsArgs["foregroundVertices"] = stacked
         elif verticesAs == "background":
-            vertsArgs["backgroundVertices"] = verts.stack()
+            vertsArgs["backgroundVertices"] = stacked
         for key in vertsArgs:
             vertsArgs[key].connected = False
         try:
@@ -433,11 +482,22 @@ class VerticesPlugin(DASM, TableFieldPlugin):
 
     @staticmethod
     def applyOffset(verticesList: t.Sequence[ComplexXYVertices], offset: XYVertices):
+        flattened = [
+            vertList for complexVerts in verticesList for vertList in complexVerts
+        ]
+        if not flattened:
+            return [ComplexXYVertices() for _ in verticesList]
+        # Offset every contour with a single add, then hand out views of the result
+        shifted = np.concatenate(flattened, axis=0) + np.reshape(offset, (1, 2))
+        splitIdxs = np.cumsum([len(vertList) for vertList in flattened])[:-1]
+        pieces = iter(np.split(shifted.view(np.ndarray), splitIdxs))
         centeredVerts = []
-        for verticesList in verticesList:
+        for complexVerts in verticesList:
             newVertList = ComplexXYVertices()
-            for vertList in verticesList:
-                newVertList.append(vertList + offset)
+            for vertList in complexVerts:
+                newVerts = next(pieces).view(XYVertices)
+                newVerts.connected = vertList.connected
+                newVertList.append(newVerts)
             centeredVerts.append(newVertList)
         return centeredVerts
 
@@ -455,12 +515,16 @@ class VerticesPlugin(DASM, TableFieldPlugin):
     def updateRegionFromMask(self, mask: BlackWhiteImg, offset=None, componentId=None):
         if offset is None:
             offset = XYVertices([0, 0])
-        data = self.region.regionData.copy()
         if componentId is None:
-            componentId = data.index[0] if len(data) else -1
-        newVerts = ComplexXYVertices.fromBinaryMask(mask).simplify(
-            self.props[CNST.PROP_REG_APPROX_EPS]
-        )
+            regionIds = self.region.regionData.index
+            componentId = regionIds[0] if len(regionIds) else -1
+        if mask.any():
+            newVerts = ComplexXYVertices.fromBinaryMask(mask).simplify(
+                self.props[CNST.PROP_REG_APPROX_EPS]
+            )
+        else:
+            # Cleared masks have no contours, so skip contour detection entirely
+            newVerts = ComplexXYVertices(hierarchy=np.empty((0, 4), dtype=int))
         df = makeMultiRegionDf(vertices=[newVerts], idList=[componentId])
         self.updateRegionUndoable(df, offset=offset, oldProcCache=self.oldResultCache)
 
@@ -468,18 +532,15 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         """
         Swaps background and foreground in the area enclosed by the region mask
         """
-        verts = ComplexXYVertices(
-            [
-                verts
-                for cplxVerts in self.region.regionData[RTF.VERTICES]
-                for verts in cplxVerts
-            ]
-        )
+        verts = self.region.regionData[RTF.VERTICES].s3averts.concatenate()
         if not len(verts):
             # Doesn't make sense to invert an empty region
             return
         offset = np.min(verts.stack(), axis=0)
-        invertedMask = verts.removeOffset(offset).toMask() == 0
+        regionMask = verts.removeOffset(offset).toMask()
+        invertedMask = self._scratchMask(regionMask.shape)
+        # Booleans share uint8's layout, so comparison results can be written directly
+        np.equal(regionMask, 0, out=invertedMask.view(bool))
         self.updateRegionFromMask(invertedMask, offset)
 
     @DASM.undoable("Modify Focused Component")
@@ -516,21 +577,7 @@ class VerticesPlugin(DASM, TableFieldPlugin):
             image. This can be computationally intensive at times, in which case
             ``simplify`` can be set to *False*
         """
-        try:
-            hierarchy = np.row_stack(
-                [v.hierarchy for v in self.region.regionData[RTF.VERTICES]]
-            )
-        except ValueError:
-            # Numpy error when all vertices are empty or no vertices present
-            hierarchy = np.empty((0, 4), dtype=int)
-        outVerts = ComplexXYVertices(
-            [
-                verts
-                for cplxVerts in self.region.regionData[RTF.VERTICES]
-                for verts in cplxVerts
-            ],
-            hierarchy=hierarchy,
-        )
+        outVerts = self.region.regionData[RTF.VERTICES].s3averts.concatenate()
         if simplify:
             return outVerts.simplify(epsilon=self.props[CNST.PROP_REG_APPROX_EPS])
         return outVerts
@@ -576,13 +623,14 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         initialImg, slices = getCroppedImage(self.mainImage.image, allVerts)
         imShape = initialImg.shape[:2]
         offset = slices[0]
-        img = np.zeros(imShape, bool)
-        outImgs.append(img)
-        for singleRegionVerts in bufferRegions:
+        # Rasterize every entry into one preallocated stack, with an empty first mask.
+        # The default fill color is 1, so the stack can be viewed as booleans directly
+        masks = np.zeros((len(bufferRegions) + 1, *imShape), "uint8")
+        for singleRegionVerts, mask in zip(bufferRegions, masks[1:]):
             # Copy to avoid screwing up undo buffer!
             copied = singleRegionVerts.removeOffset(offset)
-            img = copied.toMask(imShape, warnIfTooSmall=False) > 0
-            outImgs.append(img)
+            copied.toMask(mask, warnIfTooSmall=False)
+        outImgs.extend(masks.view(bool))
         return initialImg, outImgs
 
     @bind(info=dict(type="list", limits=[""]), alpha=dict(limits=[0, 1], step=0.01))
@@ -618,8 +666,22 @@ class VerticesPlugin(DASM, TableFieldPlugin):
         self.stageInfoImage.show()
 
     def getDisplayableInfos(self):
-        outInfos = {}
         stages = self.currentProcessor.flattenedFunctions()
+        results = [stage.result for stage in stages]
+        # Infos only change when a stage produces a new result, so reuse them as long
+        # as the same stages hold the same result objects
+        cachedStages, cachedResults, infos = self._displayableInfosCache
+        if not (
+            len(stages) == len(cachedStages)
+            and all(new is old for new, old in zip(stages, cachedStages))
+            and all(new is old for new, old in zip(results, cachedResults))
+        ):
+            infos = self._computeDisplayableInfos(stages)
+            self._displayableInfosCache = (stages, results, infos)
+        return dict(infos)
+
+    def _computeDisplayableInfos(self, stages: list):
+        outInfos = {}
         matchNames = [stage.title() for stage in stages]
         boundSlices = None
 
@@ -666,9 +728,10 @@ class VerticesPlugin(DASM, TableFieldPlugin):
             warnings.warn("No edits found, nothing to do", UserWarning, stacklevel=2)
             return
         # Add current state as final result
-        history += [history[-1]]
-        diffs = [showMaskDifference(o, n) for (o, n) in zip(history, history[1:])]
-        self.playbackWindow.setDifferenceImages(diffs)
+        history = np.stack(history + [history[-1]])
+        # Masks are compared frame-by-frame in one vectorized pass over the stack
+        diffs = showMaskDifference(history[:-1], history[1:])
+        self.playbackWindow.setDifferenceImages(list(diffs))
         self.playbackWindow.displayPlot.setImage(initialImg)
         self.playbackWindow.show()
         self.playbackWindow.raise_()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import sys
-from typing import TYPE_CHECKING, Callable, Sequence
+from functools import cached_property
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence
 
-from pyqtgraph import console as pg_console
 from pyqtgraph.Qt import QtCore
 from qtextras import ConsoleWidget
 
@@ -15,16 +16,22 @@ if TYPE_CHECKING:
 
 
 class ToolsPlugin(ParameterEditorPlugin):
-    _deferredRegisters: dict[Callable, dict] = {}
+    _deferredRegisters: dict[Callable, Mapping[str, Any]] = {}
     """
     Keeps track of requested functions to register (the key) and the arguments to pass 
-    during registration (kwargs are the value)
+    during registration (kwargs are the value). Shared by every instance, so the
+    arguments are read-only
     """
 
     createDock = True
 
+    _fieldLimits: tuple[str, ...] | None = None
+    """Field names last shown in the field info options"""
+
     def attachToWindow(self, window):
         super().attachToWindow(window)
+        # The console banner describes the window, so it must be rebuilt
+        self.__dict__.pop("_consoleText", None)
         self.registerFunction(
             self.window.mainImage.clearCurrentRoi,
             runActionTemplate={
@@ -50,8 +57,14 @@ class ToolsPlugin(ParameterEditorPlugin):
         )
 
         self._hookupFieldDisplay(window)
+        self.registerDeferredFunctions()
 
-        for deferred, kwargs in self._deferredRegisters.items():
+    def registerDeferredFunctions(self):
+        """
+        Registers every function passed to ``deferredRegisterFunction``. Functions
+        deferred while this runs are registered on the next attach instead
+        """
+        for deferred, kwargs in tuple(self._deferredRegisters.items()):
             self.registerFunction(deferred, **kwargs)
 
     def _hookupFieldDisplay(self, window):
@@ -66,38 +79,49 @@ class ToolsPlugin(ParameterEditorPlugin):
             if display.fieldDisplay.inUseDelegates:
                 display.fieldDisplay.callDelegateFunction("clear")
             else:
-                display.fieldInfoProc(
-                    ids=window.componentManager.compDf.index, force=True
-                )
+                # A full slice selects every row without an index lookup per id
+                display.fieldInfoProc(ids=slice(None), force=True)
 
         self.registerFunction(toggleAll, name="Toggle All Field Info")
 
         fieldsParam = func.parameters["fields"]
 
         def updateLims():
-            fieldsParam.setLimits(
-                [
-                    str(f)
-                    for f in window.tableData.allFields
-                    if f not in display.fieldDisplay.ignoreColumns
-                ]
+            newLimits = tuple(
+                str(f)
+                for f in window.tableData.allFields
+                if f not in display.fieldDisplay.ignoreColumns
             )
+            # Config updates often leave the fields untouched, in which case the
+            # parameter doesn't need to be rebuilt
+            if newLimits == self._fieldLimits:
+                return
+            self._fieldLimits = newLimits
+            fieldsParam.setLimits(list(newLimits))
             fieldsParam.setValue(fieldsParam.opts["limits"])
 
         window.tableData.sigConfigUpdated.connect(updateLims)
         updateLims()
 
+    def _consoleNamespace(self):
+        return dict(app=self.window, rtf=RTF)
+
+    @cached_property
+    def _consoleText(self):
+        # "dict" default is to use repr instead of string for internal elements,
+        # so expanding into string here ensures repr is not used
+        nsPrintout = [f"{k}: {v}" for k, v in self._consoleNamespace().items()]
+        return f"Starting console with variables:\n" f"{nsPrintout}"
+
     def showDevConsoleGui(self):
         """
         Opens a console that allows dynamic interaction with current variables. If
         IPython is on your system, a qt console will be loaded. Otherwise, a (less
         capable) standard pyqtgraph console will be used.
         """
-        namespace = dict(app=self.window, rtf=RTF)
-        # "dict" default is to use repr instead of string for internal elements,
-        # so expanding into string here ensures repr is not used
-        nsPrintout = [f"{k}: {v}" for k, v in namespace.items()]
-        text = f"Starting console with variables:\n" f"{nsPrintout}"
+        # Consoles can add to their namespace, so each one gets a fresh dict
+        namespace = self._consoleNamespace()
+        text = self._consoleText
         # Broad exception is fine, fallback is good enough. Too many edge cases to
         # properly diagnose when Pycharm's event loop is sync-able with the Jupyter dev
         # console noinspection PyBroadException
@@ -117,7 +141,9 @@ class ToolsPlugin(ParameterEditorPlugin):
                 )
         except Exception:
             # Ipy kernel can have issues for many reasons. Always be ready to fall back
-            # to traditional console
+            # to traditional console. It is imported here since it is rarely needed
+            from pyqtgraph import console as pg_console
+
             console = pg_console.ConsoleWidget(
                 parent=self.window, namespace=namespace, text=text
             )
@@ -126,7 +152,7 @@ class ToolsPlugin(ParameterEditorPlugin):
 
     @classmethod
     def deferredRegisterFunction(cls, func: Callable, **registerKwargs):
-        cls._deferredRegisters[func] = registerKwargs
+        cls._deferredRegisters[func] = MappingProxyType(registerKwargs)
 
 
 def functionPluginFactory(
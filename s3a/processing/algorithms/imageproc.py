@@ -1,3 +1,4 @@
+import functools
 from typing import Any, Dict, Tuple, Union
 
 import cv2 as cv
@@ -5,12 +6,13 @@ import numpy as np
 from qtextras import bindInteractorOptions as bind
 from scipy.ndimage import binary_fill_holes
 from skimage import img_as_float, morphology as morph, segmentation as seg
-from skimage.measure import label, regionprops
+from skimage.measure import label
 from skimage.morphology import flood
 
 from ..pipeline import PipelineFunction
 from ...constants import PRJ_ENUMS
 from ...generalutils import (
+    MaxSizeDict,
     cornersToFullBoundary,
     getCroppedImage,
     getObjectsDefinedInSelfModule,
@@ -31,6 +33,10 @@ UNSPEC = PRJ_ENUMS.HISTORY_UNSPECIFIED
 FGND = PRJ_ENUMS.HISTORY_FOREGROUND
 BGND = PRJ_ENUMS.HISTORY_BACKGROUND
 
+# Swaps foreground and background history values in a single lookup
+_INVERTED_HISTORY = np.arange(256, dtype="uint8")
+_INVERTED_HISTORY[[FGND, BGND]] = BGND, FGND
+
 # TODO: Establish better mechanism than global buffer
 procCache: Dict[str, Any] = {"mask": np.array([[]], "uint8")}
 """
@@ -43,20 +49,73 @@ structure. keys are:
     2 = foreground
 """
 
+_fullBoundaryCache = MaxSizeDict(maxsize=8)
+"""
+Dense boundaries keyed by their corner vertices, since reprocessing the same ROI with
+different settings would otherwise recompute them every run. Only the few most recent
+ROIs are kept, since large boundaries hold one vertex per border pixel
+"""
+
+
+def _fullBoundary(cornerVerts: XYVertices, sizeLimit=0) -> XYVertices:
+    """
+    Cached ``cornersToFullBoundary``. The result is shared between callers, so it is
+    read-only
+    """
+    key = (
+        cornerVerts.tobytes(),
+        cornerVerts.shape,
+        cornerVerts.dtype.str,
+        getattr(cornerVerts, "connected", True),
+        sizeLimit,
+    )
+    boundary = _fullBoundaryCache.get(key)
+    if boundary is None:
+        boundary = cornersToFullBoundary(cornerVerts, sizeLimit)
+        if boundary is cornerVerts:
+            # Degenerate shapes come back unchanged and can't be frozen in place
+            boundary = cornerVerts.copy()
+        boundary.flags.writeable = False
+        _fullBoundaryCache[key] = boundary
+    return boundary
+
 
 def growSeedpoint(img: NChanImg, seeds: XYVertices, thresh: float) -> BlackWhiteImg:
     shape = np.array(img.shape[0:2])
     bwOut = np.zeros(shape, dtype=bool)
     # Turn x-y vertices into row-col seeds
-    seeds = seeds[:, ::-1]
+    seeds = np.asarray(seeds[:, ::-1], dtype=np.intp)
     # Remove seeds that don't fit in the image
-    seeds = seeds[np.all(seeds >= 0, 1)]
-    seeds = seeds[np.all(seeds < shape, 1)]
-
-    for seed in seeds:
-        for chan in range(img.shape[2]):
-            curBwMask = flood(img[..., chan], tuple(seed), tolerance=thresh)
-            bwOut |= curBwMask
+    inBounds = (seeds >= 0) & (seeds < shape)
+    seeds = seeds[inBounds[:, 0] & inBounds[:, 1]]
+
+    if img.dtype not in (np.uint8, np.float32):
+        # OpenCV only floods 8-bit and single-precision images
+        img = img.astype(np.float32)
+    # OpenCV fills a mask padded by one pixel on each side. A single mask is cleared
+    # and reused for every fill instead of allocating a new one per seed
+    fillMask = np.zeros((shape[0] + 2, shape[1] + 2), dtype=np.uint8)
+    filled = fillMask[1:-1, 1:-1].view(bool)
+    # Full connectivity and a range fixed to the seed value match ``skimage`` flood
+    flags = 8 | cv.FLOODFILL_MASK_ONLY | cv.FLOODFILL_FIXED_RANGE | (1 << 8)
+    rows, cols = seeds.T
+    for chan in range(img.shape[2]):
+        chanImg = np.ascontiguousarray(img[..., chan])
+        seedValues = chanImg[rows, cols]
+        pending = np.ones(len(seeds), dtype=bool)
+        for ii, (row, col) in enumerate(seeds):
+            if not pending[ii]:
+                continue
+            # Each channel and seed is flooded independently, since previously filled
+            # pixels would otherwise block the next fill
+            fillMask.fill(0)
+            cv.floodFill(
+                chanImg, fillMask, (int(col), int(row)), 0, thresh, thresh, flags
+            )
+            bwOut |= filled
+            # A seed inside this fill with the same value would flood the exact same
+            # region, which is common for boundary seeds along a uniform area
+            pending &= ~(filled[rows, cols] & (seedValues == seedValues[ii]))
     return bwOut
 
 
@@ -98,25 +157,23 @@ def format_vertices(
 
     if useFullBoundary:
         if not foregroundVertices.empty:
-            foregroundVertices = cornersToFullBoundary(foregroundVertices)
+            foregroundVertices = _fullBoundary(foregroundVertices)
         if not backgroundVertices.empty:
-            backgroundVertices = cornersToFullBoundary(backgroundVertices)
+            backgroundVertices = _fullBoundary(backgroundVertices)
 
     procCache["mask"] = _historyMask
-    curHistory = _historyMask.copy()
     if foregroundVertices.empty and not backgroundVertices.empty:
         # Invert the mask and paint foreground pixels
         asForeground = False
-        # Invert the history mask too
-        curHistory[_historyMask == FGND] = BGND
-        curHistory[_historyMask == BGND] = FGND
+        # Invert the history mask too. The lookup also copies, so the cached mask is
+        # left untouched
+        curHistory = _INVERTED_HISTORY[_historyMask]
         foregroundVertices = backgroundVertices
         backgroundVertices = XYVertices()
-
-    if asForeground:
-        foregroundAdjustedCompMask = componentMask
-    else:
         foregroundAdjustedCompMask = ~componentMask
+    else:
+        curHistory = _historyMask.copy()
+        foregroundAdjustedCompMask = componentMask
 
     # Default to bound slices that encompass the whole image
     bounds = np.array([[0, 0], image.shape[:2][::-1]])
@@ -238,8 +295,16 @@ def crop_to_local_area(
     if image.dtype == np.uint8:
         toPlot = image.copy()
     else:
-        image = image.astype("float")
-        toPlot = (((image - np.min(image)) / image.ptp()) * 255).astype("uint8")
+        if image.dtype == bool:
+            # OpenCV has no boolean type, but reads the same bytes as uint8
+            image = image.view(np.uint8)
+        try:
+            # Min-max scaling straight to uint8 in one pass, without a float copy
+            toPlot = cv.normalize(image, None, 0, 255, cv.NORM_MINMAX, cv.CV_8U)
+        except cv.error:
+            # Types OpenCV doesn't support, i.e. float16 or uint32
+            image = image.astype("float")
+            toPlot = (((image - np.min(image)) / image.ptp()) * 255).astype("uint8")
     borderColor = 255
     if image.ndim > 2:
         borderColor = (255, *[0 for _ in range(image.shape[2] - 1)])
@@ -271,17 +336,15 @@ def apply_process_result(
     boundSlices: Tuple[slice, slice],
     resizeRatio: float,
 ):
-    if asForeground:
-        bitOperation = np.bitwise_or
-    else:
-        # Add to background
-        bitOperation = lambda curRegion, other: ~(curRegion | other)
     # The other basic operations need the rest of the component mask to work properly,
     # so expand the current area of interest only as much as needed. Returning to full
     # size now would incur unnecessary addtional processing times for the full-sized
     # image
     outMask = unformattedComponentMask.copy()
-    change = bitOperation(componentMask, image)
+    change = np.bitwise_or(componentMask, image)
+    if not asForeground:
+        # Add to background, inverting in place to avoid another temporary image
+        np.invert(change, out=change)
     if resizeRatio < 1:
         origSize = (
             boundSlices[0].stop - boundSlices[0].start,
@@ -295,14 +358,24 @@ def apply_process_result(
             asRatio=False,
             interpolation="INTER_LINEAR",
         )
-    # Vast majority of samples will be near 0 or 1, filter these out
-    subset = change[(change > 0.01) & (change < 0.99)].ravel()
-    if len(subset) == 0:
-        change = change > 0
+        # Vast majority of samples will be near 0 or 1, filter these out
+        interpolated = (change > 0.01) & (change < 0.99)
+        numInterpolated = np.count_nonzero(interpolated)
+        if numInterpolated:
+            threshold = np.sum(change, where=interpolated) / numInterpolated
+        else:
+            threshold = 0
+        change = change > threshold
     else:
-        change = change > subset.mean()
+        # Without resizing, there are no fractional values to threshold
+        change = change.astype(bool, copy=False)
     outMask[boundSlices] = change
-    xywhRect = cv.boundingRect(outMask.astype("uint8", copy=False))
+    # Booleans share uint8's layout, so viewing them avoids a full-image copy. The whole
+    # mask is scanned, since the component can extend beyond ``boundSlices``
+    if outMask.dtype == bool:
+        xywhRect = cv.boundingRect(outMask.view(np.uint8))
+    else:
+        xywhRect = cv.boundingRect(outMask.astype("uint8", copy=False))
     # Keep algorithm from failing when no foreground pixels exist
     if not any(xywhRect[2:]):
         mins = [0, 0]
@@ -323,7 +396,9 @@ def return_to_full_size(
 ):
     out = np.zeros_like(unformattedComponentMask)
     if image.ndim > 2:
-        image = image.mean(2).astype(int)
+        # A truncated channel mean is nonzero exactly when the channel sum reaches the
+        # channel count, which skips the float mean and integer cast
+        image = image.sum(2) >= image.shape[2]
     out[boundSlices] = image
 
     infoMask = showMaskDifference(unformattedComponentMask[boundSlices], image)
@@ -332,7 +407,14 @@ def return_to_full_size(
 
 
 def fill_holes(image: NChanImg):
-    return dict(image=binary_fill_holes(image))
+    if image.ndim != 2:
+        return dict(image=binary_fill_holes(image))
+    # A background border connects every region touching the image edge, so a single
+    # fill from the corner marks all background that isn't a hole
+    padded = np.zeros((image.shape[0] + 2, image.shape[1] + 2), dtype=np.uint8)
+    np.not_equal(image, 0, out=padded[1:-1, 1:-1].view(bool))
+    cv.floodFill(padded, None, (0, 0), 2, flags=4)
+    return dict(image=padded[1:-1, 1:-1] != 2)
 
 
 def disallow_paint_tool(
@@ -367,13 +449,21 @@ def morph_op(image: NChanImg, op: int, radius=1, shape="rectangle"):
     """
     if image.ndim > 2:
         image = image.mean(2)
-    image = image.astype("uint8")
+    # OpenCV doesn't modify its input, so there's no need to copy uint8 images
+    image = image.astype("uint8", copy=False)
+    outImg = cv.morphologyEx(image, op, _structuringElement(shape, radius))
+    return dict(image=outImg)
+
+
+@functools.lru_cache(maxsize=None)
+def _structuringElement(shape: str, radius: int):
     ksize = [radius]
     if shape == "rectangle":
         ksize = [ksize[0] * 2 + 1] * 2
     strel = getattr(morph, shape)(*ksize)
-    outImg = cv.morphologyEx(image.copy(), op, strel)
-    return dict(image=outImg)
+    # Every caller shares the cached kernel
+    strel.flags.writeable = False
+    return strel
 
 
 class OpenAndClose(PipelineFunction):
@@ -408,19 +498,21 @@ def keep_largest_component(image: NChanImg):
     if not np.any(image):
         return dict(image=image)
     areas, labels = _cvConnComps(image)
-    # 0 is background, so skip it
-    out = np.zeros_like(image, shape=image.shape[:2])
+    # Lookup table indexed by label, where 0 is background and stays off
+    keepLabel = np.zeros(areas.size + 1, dtype=image.dtype)
     # Offset by 1 since 0 was removed earlier
-    maxAreaIdx = np.argmax(areas) + 1
-    out[labels == maxAreaIdx] = True
-    return dict(image=out)
+    keepLabel[np.argmax(areas) + 1] = True
+    return dict(image=keepLabel[labels])
 
 
 def remove_small_components(image: NChanImg, sizeThreshold=30):
     areas, labels = _cvConnComps(image, areaOnly=True)
-    validLabels = np.flatnonzero(areas >= sizeThreshold) + 1
-    out = np.isin(labels, validLabels)
-    return dict(image=out)
+    # Indexing a per-label lookup table is a single pass over the labels, unlike
+    # ``np.isin`` which sorts and searches
+    keepLabel = np.empty(areas.size + 1, dtype=bool)
+    keepLabel[0] = False
+    np.greater_equal(areas, sizeThreshold, out=keepLabel[1:])
+    return dict(image=keepLabel[labels])
 
 
 def draw_vertices(image: NChanImg, foregroundVertices: XYVertices):
@@ -433,11 +525,39 @@ def draw_vertices(image: NChanImg, foregroundVertices: XYVertices):
 
 def convert_to_squares(image: NChanImg):
     outMask = np.zeros(image.shape, dtype=bool)
-    for region in regionprops(label(image)):
-        outMask[region.bbox[0] : region.bbox[2], region.bbox[1] : region.bbox[3]] = True
+    # Bounding boxes come straight from the labeling stats, with no per-region objects
+    stats = _cvConnComps(image, returnLabels=False, areaOnly=False)
+    for left, top, width, height, _area in stats:
+        outMask[top : top + height, left : left + width] = True
     return dict(image=outMask)
 
 
+# Grabcut labels indexed by (history value, component value). Explicit history wins,
+# otherwise components of 1 are probable foreground and 0 probable background. Other
+# component values (i.e. 255 or label numbers) are left as definite background
+_GRABCUT_LABELS = np.full((256, 256), cv.GC_BGD, dtype="uint8")
+_GRABCUT_LABELS[:, 0] = cv.GC_PR_BGD
+_GRABCUT_LABELS[:, 1] = cv.GC_PR_FGD
+_GRABCUT_LABELS[FGND] = cv.GC_FGD
+_GRABCUT_LABELS[BGND] = cv.GC_BGD
+
+
+def _grabcutLabels(componentMask: np.ndarray, historyMask: GrayImg) -> np.ndarray:
+    """
+    Gathers the initial grabcut mask from ``_GRABCUT_LABELS`` in one lookup
+    """
+    if componentMask.dtype == bool:
+        componentValues = componentMask.view(np.uint8)
+    elif componentMask.dtype == np.uint8:
+        componentValues = componentMask
+    else:
+        # Any value besides 0 and 1 maps to a column left as definite background
+        componentValues = np.full(componentMask.shape, 2, dtype=np.uint8)
+        componentValues[componentMask == 0] = 0
+        componentValues[componentMask == 1] = 1
+    return _GRABCUT_LABELS[historyMask, componentValues]
+
+
 class CvGrabcut(PipelineFunction):
     def __init__(self, **kwargs):
         super().__init__(self.grabcut, "cv_grabcut", **kwargs)
@@ -454,15 +574,14 @@ class CvGrabcut(PipelineFunction):
         if image.size == 0:
             return dict(image=np.zeros_like(componentMask))
         img = cv.cvtColor(image, cv.COLOR_RGB2BGR)
-        historyMask = historyMask.copy()
-        if historyMask.size:
-            historyMask[foregroundVertices.rows, foregroundVertices.columns] = FGND
-        mask = np.zeros(componentMask.shape, dtype="uint8")
-        if historyMask.shape == mask.shape:
-            mask[componentMask == 1] = cv.GC_PR_FGD
-            mask[componentMask == 0] = cv.GC_PR_BGD
-            mask[historyMask == FGND] = cv.GC_FGD
-            mask[historyMask == BGND] = cv.GC_BGD
+        if historyMask.shape == componentMask.shape:
+            # One lookup resolves the history and component labels together
+            mask = _grabcutLabels(componentMask, historyMask)
+            # Foreground vertices override the history, so they are marked directly
+            # rather than on a copy of the history mask
+            mask[foregroundVertices.rows, foregroundVertices.columns] = cv.GC_FGD
+        else:
+            mask = np.zeros(componentMask.shape, dtype="uint8")
         if len(foregroundVertices) and np.all(foregroundVertices.ptp(0) > 1):
             cvRect = np.array(
                 [np.min(foregroundVertices, axis=0), foregroundVertices.ptp(0)]
@@ -528,8 +647,8 @@ def k_means_segmentation(image: NChanImg, kValue=5, attempts=10):
     # Logic taken from
     # https://docs.opencv.org/master/d1/d5c/tutorial_py_kmeans_opencv.html
     numChannels = 1 if image.ndim < 3 else image.shape[2]
-    clrs = image.reshape(-1, numChannels)
-    clrs = clrs.astype("float32")
+    # kmeans only reads the samples, so float32 images need no copy
+    clrs = image.reshape(-1, numChannels).astype("float32", copy=False)
     criteria = (cv.TERM_CRITERIA_EPS + cv.TERM_CRITERIA_MAX_ITER, 10, 1.0)
     ret, lbls, imgMeans = cv.kmeans(
         clrs, kValue, None, criteria, attempts, cv.KMEANS_RANDOM_CENTERS
@@ -549,9 +668,9 @@ def _labelBoundaries_cv(labels: np.ndarray, thickness: int):
     if labels.dtype not in [np.uint8, np.uint16, np.int16, np.float16, np.float32]:
         labels = labels.astype(np.uint16)
     strel = cv.getStructuringElement(cv.MORPH_RECT, (thickness, thickness))
-    return cv.morphologyEx(labels, cv.MORPH_DILATE, strel) != cv.morphologyEx(
-        labels, cv.MORPH_ERODE, strel
-    )
+    # Dilation never falls below erosion, so their difference (the morphological
+    # gradient) is nonzero exactly where they disagree
+    return cv.morphologyEx(labels, cv.MORPH_GRADIENT, strel) != 0
 
 
 def binarize_labels(
@@ -618,12 +737,7 @@ def binarize_labels(
         out[historyMask == BGND] = False
     nChans = image.shape[2]
     if useMeanColor:
-        summaryImg = np.zeros_like(image)
-        # Offset by 1 to avoid missing 0-labels
-        for lbl in regionprops(labels + 1):
-            coords = lbl.coords
-            intensity = image[coords[:, 0], coords[:, 1], ...].mean(0)
-            summaryImg[coords[:, 0], coords[:, 1], :] = intensity
+        summaryImg = _labelMeanColors(image, labels)
     else:
         boundaries = _labelBoundaries_cv(labels, lineThickness)
         summaryImg = image.copy()
@@ -634,6 +748,36 @@ def binarize_labels(
     return dict(image=out, info={"image": summaryImg})
 
 
+def _labelMeanColors(image: NChanImg, labels: np.ndarray):
+    """
+    Colors every labeled region of ``image`` with its mean color. Per-label sums and
+    counts take one pass over the image each, rather than a loop over every region.
+    Negative labels (i.e. -1) are unlabeled and stay 0
+    """
+    if labels.size == 0:
+        return np.zeros_like(image)
+    nChans = image.shape[2]
+    flatLabels = labels.ravel()
+    # Bincounts need non-negative labels
+    minLabel = flatLabels.min()
+    if minLabel != 0:
+        flatLabels = flatLabels - minLabel
+    flatLabels = flatLabels.astype(np.intp, copy=False)
+    counts = np.bincount(flatLabels)
+    flatImage = image.reshape(-1, nChans)
+    means = np.empty((len(counts), nChans), dtype=float)
+    for chan in range(nChans):
+        means[:, chan] = np.bincount(
+            flatLabels, weights=flatImage[:, chan], minlength=len(counts)
+        )
+    # Labels between the min and max that never occur have no pixels to divide by
+    means /= np.maximum(counts, 1)[:, None]
+    if minLabel < 0:
+        # The first bins hold negative labels, which are treated as unlabeled
+        means[:-minLabel] = 0
+    return means.astype(image.dtype)[flatLabels].reshape(image.shape)
+
+
 def region_grow_segmentation(
     image: NChanImg, foregroundVertices: XYVertices, seedThreshold=10
 ):
@@ -645,7 +789,7 @@ def region_grow_segmentation(
     # outMask = np.zeros(image.shape[0:2], bool)
     # For small enough shapes, get all boundary pixels instead of just shape vertices
     if foregroundVertices.connected:
-        foregroundVertices = cornersToFullBoundary(foregroundVertices, 50e3)
+        foregroundVertices = _fullBoundary(foregroundVertices, 50e3)
 
     # Don't let region grow outside area of effect
     # img_aoe, coords = getCroppedImg(
@@ -38,7 +38,8 @@ class StageAncestryPrinter:
 
     def __init__(self, stage: PipelineFunction):
         stages = []
-        while stage and isinstance(stage, PipelineStageType.__args__):
+        stageTypes = PipelineStageType.__args__
+        while stage and isinstance(stage, stageTypes):
             stages.append(stage)
             stage = stage.parent()
         # Reverse the list so that the first stage is at the beginning
@@ -421,11 +422,21 @@ class ImagePipeline(PipelineParameter):
 
         oldResize = outGrid.resizeEvent
 
-        def newResize(ev):
-            oldResize(ev)
+        def autoRangeAll():
             for ax in sizeToAxMapping.values():
                 ax.getViewBox().autoRange()
 
+        # Dragging a window edge fires a resize event per pixel, so ranging every plot
+        # waits until the resize pauses
+        rangeTimer = QtCore.QTimer(outGrid)
+        rangeTimer.setSingleShot(True)
+        rangeTimer.setInterval(50)
+        rangeTimer.timeout.connect(autoRangeAll)
+
+        def newResize(ev):
+            oldResize(ev)
+            rangeTimer.start()
+
         # Windows that go out of scope get garbage collected. Prevent that here
         self._winRefs.append(outGrid)
         outGrid.closeEvent = newClose
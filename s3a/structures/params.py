@@ -66,6 +66,29 @@ class OptionsDictGroup:
         warn(baseWarnMsg + f"Defaulting to {default}", UserWarning, stacklevel=2)
         return default
 
+    @staticmethod
+    def fieldsFromParameters(
+        group: Collection[OptionsDict],
+        parameters: Collection[Union[str, OptionsDict]],
+        default: OptionsDict = None,
+    ):
+        """
+        Like :meth:`fieldFromParameter` for several parameters at once. Names in
+        ``group`` are lowercased a single time instead of once per requested parameter
+        """
+        lookup = {}
+        for matchParam in group:
+            # The first match wins, as in ``fieldFromParameter``
+            lookup.setdefault(str(matchParam).lower(), matchParam)
+        out = []
+        for parameter in parameters:
+            field = lookup.get(str(parameter).lower())
+            if field is None:
+                # Defer to the single lookup for its default and error handling
+                field = OptionsDictGroup.fieldFromParameter(group, parameter, default)
+            out.append(field)
+        return out
+
     @classmethod
     def getDefault(cls) -> Optional[OptionsDict]:
         """
@@ -493,6 +493,24 @@ class S3AVertsAccessor:
                 newIds.append(idx)
         return pd.Series(newVerts, index=newIds, name=self.verts.name)
 
+    def concatenate(self):
+        """
+        Forms one single ComplexXYVertices object holding every contour from a series
+        of ComplexXYVertices regions, in order. Unlike ``merge``, no rasterization
+        happens, so overlapping contours are kept as-is. Hierarchies are stacked
+        without adjusting their indexes.
+        """
+        contours = [verts for complexVerts in self.verts for verts in complexVerts]
+        # Empty masks produce (0, 1, 4) hierarchies, so flatten before stacking
+        hierarchies = [
+            np.reshape(complexVerts.hierarchy, (-1, 4)) for complexVerts in self.verts
+        ]
+        if hierarchies:
+            hierarchy = np.concatenate(hierarchies, axis=0)
+        else:
+            hierarchy = np.empty((0, 4), dtype=int)
+        return ComplexXYVertices(contours, hierarchy=hierarchy)
+
     def merge(self):
         """
         Forms one single ComplexXYVertices object from a series of ComplexXYVertices
@@ -323,7 +323,7 @@ class FieldDisplay:
             fields = allFields
         else:
             # user arguments could be strings
-            fields = [OptionsDictGroup.fieldFromParameter(allFields, f) for f in fields]
+            fields = OptionsDictGroup.fieldsFromParameters(allFields, fields)
 
         defaultFields = [
             f
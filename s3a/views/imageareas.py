@@ -55,6 +55,10 @@ class MainImage(DASM, ImageViewer):
         self._initGrid()
         self.lastClickPos = QtCore.QPoint()
         self.toolbar = toolbar
+        self._lastCursorPos: np.ndarray | None = None
+        self._lastCursorValue: np.ndarray | None = None
+        # A new image can have a different color under the same cursor position
+        self.imageItem.sigImageChanged.connect(self._resetCursorInfo)
 
         self.toolsEditor.registerFunction(
             self.resetZoom, runActionTemplate=CNST.TOOL_RESET_ZOOM
@@ -164,6 +168,23 @@ class MainImage(DASM, ImageViewer):
         if not ev.isAccepted():
             super().mouseMoveEvent(ev)
 
+    def updateCursorInfo(self, xyPos: np.ndarray, pxValue: np.ndarray):
+        if pxValue is None:
+            return
+        # Most mouse moves stay on the same image pixel, and refreshing the label text
+        # and style sheet for each of them is wasted work
+        if np.array_equal(xyPos, self._lastCursorPos) and np.array_equal(
+            pxValue, self._lastCursorValue
+        ):
+            return
+        # ``pxValue`` is usually a view into the image, so keep a copy
+        self._lastCursorPos = np.array(xyPos)
+        self._lastCursorValue = np.array(pxValue)
+        super().updateCursorInfo(xyPos, pxValue)
+
+    def _resetCursorInfo(self):
+        self._lastCursorPos = self._lastCursorValue = None
+
     def mouseReleaseEvent(self, ev: QtGui.QMouseEvent):
         # Typical reaction is to right-click to cancel an roi
         if self.image is not None and QtCore.Qt.MouseButton.RightButton not in [
@@ -286,6 +307,33 @@ class MainImage(DASM, ImageViewer):
             ) and option.get("shortcut"):
                 self.toolsEditor.registerObjectShortcut(button, **dict(option))
 
+    def registerDrawActions(
+        self,
+        actionFunctionPairs: Sequence[
+            tuple[Union[OptionsDict, Sequence[OptionsDict]], DrawActFn]
+        ],
+        **registerOpts,
+    ):
+        """
+        Calls :meth:`registerDrawAction` for each ``(actionOptions, function)`` pair,
+        repainting the action buttons once after all are added rather than once per
+        new button.
+
+        Parameters
+        ----------
+        actionFunctionPairs
+            ``actionOptions`` and ``function`` arguments to ``registerDrawAction``
+        registerOpts
+            Extra arguments for button registration
+        """
+        group = self.drawActionGroup
+        group.setUpdatesEnabled(False)
+        try:
+            for actionOptions, function in actionFunctionPairs:
+                self.registerDrawAction(actionOptions, function, **registerOpts)
+        finally:
+            group.setUpdatesEnabled(True)
+
     def viewboxCoords(self, margin=0):
         """
         Returns the dimensions of the viewbox as (x,y) coordinates of its boundaries
@@ -86,6 +86,12 @@ class MultiRegionPlot(BoundScatterPlot):
         self.setParent(parent)
         self.setZValue(50)
         self.regionData = makeMultiRegionDf(0)
+        self.dataVersion = 0
+        """
+        Incremented whenever ``regionData`` vertices or labels change, so derived data
+        (i.e. rasterized masks) can be cached. Code that edits ``regionData`` in place
+        must call ``markDataChanged``
+        """
         self._symbolCache = None
         self.cmap = np.array([])
         self.updateColors()
@@ -153,8 +159,13 @@ class MultiRegionPlot(BoundScatterPlot):
         if newRegionDf is not None:
             overlap = self.regionData.columns.intersection(newRegionDf.columns)
             self.regionData[overlap] = newRegionDf[overlap]
+        self.markDataChanged()
         self.updatePlot()
 
+    def markDataChanged(self):
+        """Signals that ``regionData`` vertices or labels changed"""
+        self.dataVersion += 1
+
     def selectById(self, selectedIds: OneDArr):
         """
         Marks 'selectedIds' as currently selected by changing their scheme to